@@ -93,8 +93,15 @@ agent_status = {
     "last_cycle": None,
 }
 
-# SSE subscribers: list of asyncio.Queue objects for live event streaming
-sse_subscribers: list[asyncio.Queue] = []
+# SSE subscribers: immutable tuple of asyncio.Queue objects for live event
+# streaming. Only rebound (copy-on-write) by _add/_remove_subscriber, so
+# broadcasts always iterate a consistent snapshot without locking.
+sse_subscribers: tuple[asyncio.Queue, ...] = ()
+
+# SSE framing — events are framed once in _broadcast_event and queued as bytes
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_KEEPALIVE_FRAME = b": keepalive\n\n"
 
 # MCP Servers
 memory_server = create_sdk_mcp_server(name="memory", version="1.0.0", tools=ALL_MEMORY_TOOLS)
@@ -364,18 +371,25 @@ def _parse_subagent_md(name: str) -> dict:
 # Agent Cycle
 # ─────────────────────────────────────────────────────────
 
+def _add_subscriber(q: asyncio.Queue):
+    global sse_subscribers
+    sse_subscribers = (*sse_subscribers, q)
+
+
+def _remove_subscriber(q: asyncio.Queue):
+    global sse_subscribers
+    sse_subscribers = tuple(s for s in sse_subscribers if s is not q)
+
+
 def _broadcast_event(event_type: str, data: dict):
     """Send an event to all SSE subscribers and log it."""
     payload = json.dumps({"type": event_type, "time": datetime.now().isoformat(), **data})
-    dead = []
-    for i, q in enumerate(sse_subscribers):
+    frame = b"".join((_SSE_PREFIX, payload.encode(), _SSE_SUFFIX))
+    for q in sse_subscribers:
         try:
-            q.put_nowait(payload)
+            q.put_nowait(frame)
         except asyncio.QueueFull:
-            dead.append(i)
-    # Clean up dead subscribers
-    for i in reversed(dead):
-        sse_subscribers.pop(i)
+            _remove_subscriber(q)
 
 
 async def _send_webhook(data: dict):
@@ -1020,6 +1034,12 @@ from pydantic import BaseModel
 from typing import Optional
 import uvicorn
 
+try:
+    import orjson  # noqa: F401 — ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    FastJSONResponse = JSONResponse
+
 
 class TaskRequest(BaseModel):
     title: str
@@ -1101,7 +1121,7 @@ async def add_task(req: TaskRequest):
     return TaskResponse(task_id=task_id, status="pending", message=message)
 
 
-@app.get("/status")
+@app.get("/status", response_class=FastJSONResponse)
 async def get_status():
     """Current daemon state + task statistics."""
     stats = memory.get_task_stats()
@@ -1118,7 +1138,7 @@ async def get_status():
     }
 
 
-@app.get("/tasks")
+@app.get("/tasks", response_class=FastJSONResponse)
 async def get_tasks(status: str = "pending", limit: int = 20):
     """Get tasks by status."""
     with memory._conn() as conn:
@@ -1126,10 +1146,10 @@ async def get_tasks(status: str = "pending", limit: int = 20):
             "SELECT * FROM tasks WHERE status = ? ORDER BY priority ASC LIMIT ?",
             (status, limit),
         ).fetchall()
-        return [dict(r) for r in rows]
+    return FastJSONResponse(content=[dict(r) for r in rows])
 
 
-@app.get("/scheduled")
+@app.get("/scheduled", response_class=FastJSONResponse)
 async def get_scheduled():
     """Get future scheduled tasks (not yet due)."""
     return memory.get_scheduled_tasks()
@@ -1138,11 +1158,10 @@ async def get_scheduled():
 @app.get("/tasks/{task_id}")
 async def get_task(task_id: int):
     """Get a specific task with its conversation history."""
-    task = memory.get_task(task_id)
-    if not task:
+    result = memory.get_task_with_conversations(task_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    convos = memory.get_task_conversations(task_id)
-    return {"task": task, "conversations": convos}
+    return result
 
 
 @app.delete("/tasks/{task_id}")
@@ -1216,13 +1235,13 @@ async def wake_agent():
     return {"message": "Agent waking up!"}
 
 
-@app.get("/history")
+@app.get("/history", response_class=FastJSONResponse)
 async def get_history(limit: int = 30):
     """Recent conversation history."""
-    return memory.get_conversation_history(limit=limit)
+    return FastJSONResponse(content=memory.get_conversation_history(limit=limit))
 
 
-@app.get("/learnings")
+@app.get("/learnings", response_class=FastJSONResponse)
 async def get_learnings(category: str = None):
     """Agent learnings and patterns."""
     return memory.get_learnings(category=category)
@@ -1245,24 +1264,23 @@ async def events():
     Events: cycle_start, cycle_end, task_start, task_end, task_error, agent_text, tool_use
     """
     q: asyncio.Queue = asyncio.Queue(maxsize=100)
-    sse_subscribers.append(q)
+    _add_subscriber(q)
 
     async def event_stream():
         try:
             # Send initial connected event
-            yield f"data: {json.dumps({'type': 'connected', 'time': datetime.now().isoformat(), 'status': agent_status})}\n\n"
+            connected = json.dumps({'type': 'connected', 'time': datetime.now().isoformat(), 'status': agent_status})
+            yield b"".join((_SSE_PREFIX, connected.encode(), _SSE_SUFFIX))
             while True:
                 try:
-                    payload = await asyncio.wait_for(q.get(), timeout=30)
-                    yield f"data: {payload}\n\n"
+                    yield await asyncio.wait_for(q.get(), timeout=30)
                 except asyncio.TimeoutError:
                     # Keepalive
-                    yield f": keepalive\n\n"
+                    yield _KEEPALIVE_FRAME
         except asyncio.CancelledError:
             pass
         finally:
-            if q in sse_subscribers:
-                sse_subscribers.remove(q)
+            _remove_subscriber(q)
 
     return StreamingResponse(
         event_stream(),
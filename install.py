@@ -15,11 +15,31 @@ Usage:
 
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROACTIVE_DIR = Path(__file__).resolve().parent
 REACT_DIR = PROACTIVE_DIR / "react-claude-chat"
 
+# pip, npm and mkdir run concurrently — keep their progress lines from interleaving
+_print_lock = threading.Lock()
+
+
+def log(*args, **kwargs):
+    with _print_lock:
+        print(*args, **kwargs, flush=True)
+
+
+def _run_quiet(cmd: list[str], cwd: Path) -> subprocess.CompletedProcess:
+    """Run a command with output captured; dump the tail of it on failure."""
+    result = subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True,
+                            encoding="utf-8", errors="replace")
+    if result.returncode != 0:
+        tail = "\n".join((result.stdout + result.stderr).strip().splitlines()[-15:])
+        log(f"  [{' '.join(cmd[-2:])}] failed:\n{tail}")
+    return result
+
 
 def check_python():
     """Check Python 3.11+."""
@@ -33,53 +53,50 @@ def check_python():
 
 def install_deps():
     """Install Python dependencies."""
-    print("\nInstalling Python dependencies...")
+    log("\nInstalling Python dependencies...")
     req_file = PROACTIVE_DIR / "requirements.txt"
     if not req_file.exists():
-        print(f"  WARNING: {req_file} not found")
+        log(f"  WARNING: {req_file} not found")
         return
-    result = subprocess.run(
+    result = _run_quiet(
         [sys.executable, "-m", "pip", "install", "-r", str(req_file)],
-        cwd=str(PROACTIVE_DIR),
+        PROACTIVE_DIR,
     )
     if result.returncode != 0:
-        print("  WARNING: Some dependencies failed to install")
+        log("  WARNING: Some dependencies failed to install")
     else:
-        print("  OK")
+        log("  OK — Python dependencies installed")
 
 
 def build_react():
     """Build React UI if Node.js is available."""
     if not REACT_DIR.exists():
-        print("\nReact UI directory not found, skipping frontend build")
+        log("\nReact UI directory not found, skipping frontend build")
         return
 
     # Check if npm is available
     try:
         subprocess.run(["npm", "--version"], capture_output=True, check=True)
     except (FileNotFoundError, subprocess.CalledProcessError):
-        print("\nnpm not found, skipping frontend build")
-        print("  Install Node.js to build the React UI")
+        log("\nnpm not found, skipping frontend build\n  Install Node.js to build the React UI")
         return
 
-    print("\nInstalling frontend dependencies...")
-    subprocess.run(["npm", "install"], cwd=str(REACT_DIR))
+    log("\nInstalling frontend dependencies...")
+    _run_quiet(["npm", "install"], REACT_DIR)
 
-    print("Building React UI...")
-    result = subprocess.run(["npm", "run", "build"], cwd=str(REACT_DIR))
+    log("Building React UI...")
+    result = _run_quiet(["npm", "run", "build"], REACT_DIR)
     if result.returncode == 0:
-        print("  OK — React build ready")
+        log("  OK — React build ready")
     else:
-        print("  WARNING: React build failed (you can still use the API)")
+        log("  WARNING: React build failed (you can still use the API)")
 
 
 def create_dirs():
     """Create required directories."""
-    print("\nCreating directories...")
     for d in ["data", "logs", "reports"]:
         (PROACTIVE_DIR / d).mkdir(exist_ok=True)
-        print(f"  {d}/")
-    print("  OK")
+    log("\nCreating directories...\n  data/ logs/ reports/\n  OK")
 
 
 def run_wizard():
@@ -95,9 +112,16 @@ def main():
     print()
 
     check_python()
-    install_deps()
-    create_dirs()
-    build_react()
+
+    # pip (network) and npm (network + CPU) are independent — run them side by side
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        deps = ex.submit(install_deps)
+        react = ex.submit(build_react)
+        create_dirs()
+        deps.result()
+        react.result()
+
+    # Interactive, so only after everything else is done
     run_wizard()
 
 
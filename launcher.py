@@ -12,10 +12,10 @@ Usage:
 """
 
 import os
+import re
 import sys
 import time
 import shutil
-import signal
 import subprocess
 import webbrowser
 from pathlib import Path
@@ -24,13 +24,17 @@ PROACTIVE_DIR = Path(__file__).resolve().parent
 REQUIREMENTS_FILE = PROACTIVE_DIR / "requirements.txt"
 REACT_DIST = PROACTIVE_DIR / "react-claude-chat" / "dist"
 STAMP_FILE = PROACTIVE_DIR / "data" / ".deps_installed"
+SKILLS_STAMP = PROACTIVE_DIR / "data" / ".skills_installed"
 VENV_DIR = PROACTIVE_DIR / ".venv"
 BUNDLED_SKILLS = PROACTIVE_DIR / "skills"
 CONFIG_FILE = PROACTIVE_DIR / "config.yaml"
 CONFIG_EXAMPLE = PROACTIVE_DIR / "config.yaml.example"
 
-# Track child processes for cleanup
-_children: list[subprocess.Popen] = []
+# Set when the launcher re-executes itself under the .venv interpreter
+BOOTSTRAPPED_ENV = "AGELCLAW_LAUNCHER_BOOTSTRAPPED"
+
+# Simple parsing to avoid importing yaml before venv deps
+_PORT_RE = re.compile(rb"^\s*api_port:\s*(\d+)", re.M)
 
 
 def _venv_python() -> str:
@@ -119,20 +123,30 @@ def copy_skills():
         print("[SKIP] No bundled skills directory")
         return
 
+    # Adding/removing a bundled skill bumps the directory mtime — until then
+    # a single stat of the stamp replaces the per-skill scan
+    if SKILLS_STAMP.exists() and SKILLS_STAMP.stat().st_mtime >= BUNDLED_SKILLS.stat().st_mtime:
+        print("[OK] All skills already installed")
+        return
+
     # Skills go one level up from proactive/ into .Claude/Skills/
     runtime_skills = PROACTIVE_DIR.parent / ".Claude" / "Skills"
     runtime_skills.mkdir(parents=True, exist_ok=True)
 
+    with os.scandir(BUNDLED_SKILLS) as it:
+        entries = sorted((e for e in it if e.is_dir(follow_symlinks=False)), key=lambda e: e.name)
+
     copied = 0
-    for skill_dir in sorted(BUNDLED_SKILLS.iterdir()):
-        if not skill_dir.is_dir():
-            continue
-        dest = runtime_skills / skill_dir.name
+    for entry in entries:
+        dest = runtime_skills / entry.name
         if dest.exists():
             continue  # Don't overwrite user-modified skills
-        shutil.copytree(str(skill_dir), str(dest))
+        shutil.copytree(entry.path, str(dest))
         copied += 1
 
+    SKILLS_STAMP.parent.mkdir(parents=True, exist_ok=True)
+    SKILLS_STAMP.touch()
+
     if copied:
         print(f"[OK] Installed {copied} skills")
     else:
@@ -153,41 +167,75 @@ def copy_config():
         print("[WARN] No config.yaml.example found — create config.yaml manually")
 
 
-def start_server(port: int) -> subprocess.Popen:
-    """Start api_server.py using the .venv Python."""
+def ensure_venv_interpreter():
+    """Re-run the launcher under the .venv Python so the server can run in-process.
+
+    The launcher is usually started with the system Python, which doesn't have
+    the server dependencies. After the venv is ready we hand over to the venv
+    interpreter once; the bootstrap steps are skipped on the second pass.
+    """
+    if Path(sys.prefix).resolve() == VENV_DIR.resolve():
+        return
+
+    vpy = _venv_python()
+    args = [vpy, str(Path(__file__).resolve()), *sys.argv[1:]]
+    os.environ[BOOTSTRAPPED_ENV] = "1"
+    sys.stdout.flush()
+    if sys.platform == "win32":
+        # os.execv on Windows spawns a detached child and breaks Ctrl+C
+        sys.exit(subprocess.call(args, cwd=str(PROACTIVE_DIR)))
+    os.execv(vpy, args)
+
+
+def run_server(port: int):
+    """Run api_server's FastAPI app with uvicorn in this process.
+
+    Opens the browser as soon as uvicorn reports it's listening, then blocks
+    until the server exits (Ctrl+C / SIGTERM trigger a graceful shutdown).
+    """
+    import asyncio
+    import uvicorn
+
     server_script = PROACTIVE_DIR / "api_server.py"
     if not server_script.exists():
         print(f"[ERROR] {server_script} not found")
         sys.exit(1)
 
-    vpy = _venv_python()
-    print(f"[...] Starting API server on port {port}...")
-    creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-    proc = subprocess.Popen(
-        [vpy, str(server_script)],
-        cwd=str(PROACTIVE_DIR),
-        creationflags=creation_flags,
-    )
-    _children.append(proc)
-    return proc
+    os.chdir(PROACTIVE_DIR)
+    if str(PROACTIVE_DIR) not in sys.path:
+        sys.path.insert(0, str(PROACTIVE_DIR))
 
+    print(f"[...] Starting API server on port {port}...")
+    config = uvicorn.Config("api_server:app", host="0.0.0.0", port=port, log_level="info")
+    server = uvicorn.Server(config)
+
+    async def _run():
+        task = asyncio.create_task(server.serve())
+        delay = 0.01
+        while not server.started:
+            if task.done():
+                # Startup failed (port in use, import error, ...)
+                await task
+                print("[ERROR] Server failed to start")
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 0.2)
 
-def wait_for_server(port: int, timeout: int = 30) -> bool:
-    """Poll /api/health until the server is ready."""
-    import urllib.request
-    import urllib.error
+        print(f"[OK] Server is ready at http://localhost:{port}")
+        open_browser(port)
+        print()
+        print("-" * 50)
+        print(f"  Server running at http://localhost:{port}")
+        print("  Press Ctrl+C to stop all services")
+        print("-" * 50)
+        print()
+        await task
 
-    url = f"http://localhost:{port}/api/health"
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            with urllib.request.urlopen(url, timeout=2) as resp:
-                if resp.status == 200:
-                    return True
-        except (urllib.error.URLError, ConnectionError, OSError):
-            pass
-        time.sleep(0.5)
-    return False
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        pass
+    print("[OK] All services stopped. Goodbye!")
 
 
 def open_browser(port: int):
@@ -208,91 +256,44 @@ def get_port() -> int:
                 pass
 
     # Read from config.yaml
-    if CONFIG_FILE.exists():
-        try:
-            # Use simple parsing to avoid importing yaml before venv deps
-            text = CONFIG_FILE.read_text(encoding="utf-8")
-            for line in text.splitlines():
-                if line.strip().startswith("api_port:"):
-                    return int(line.split(":", 1)[1].strip())
-        except Exception:
-            pass
+    try:
+        m = _PORT_RE.search(CONFIG_FILE.read_bytes())
+    except OSError:
+        m = None
+    if m:
+        return int(m.group(1))
 
     return 8000
 
 
-def cleanup(*_args):
-    """Gracefully stop all child processes."""
-    print("\n[...] Shutting down...")
-    for proc in _children:
-        try:
-            proc.terminate()
-            proc.wait(timeout=5)
-        except Exception:
-            try:
-                proc.kill()
-            except Exception:
-                pass
-    print("[OK] All services stopped. Goodbye!")
-    sys.exit(0)
-
-
 def main():
-    print_banner()
+    if not os.environ.get(BOOTSTRAPPED_ENV):
+        print_banner()
 
-    # Step 1: Check Python 3.11+
-    check_python()
+        # Step 1: Check Python 3.11+
+        check_python()
 
-    # Step 2: Create virtual environment
-    create_venv()
+        # Step 2: Create virtual environment
+        create_venv()
 
-    # Step 3: Install dependencies in .venv
-    install_deps()
+        # Step 3: Install dependencies in .venv
+        install_deps()
 
-    # Step 4: Create data/logs/reports dirs
+    # Step 4: Continue under the .venv interpreter (no-op if already there)
+    ensure_venv_interpreter()
+
+    # Step 5: Create data/logs/reports dirs
     ensure_dirs()
 
-    # Step 5: Copy bundled skills
+    # Step 6: Copy bundled skills
     copy_skills()
 
-    # Step 6: Copy config.yaml.example on first run
+    # Step 7: Copy config.yaml.example on first run
     copy_config()
 
-    # Step 7: Start API server
-    port = get_port()
-    server_proc = start_server(port)
-
-    # Step 8: Wait for /api/health
-    if wait_for_server(port):
-        print(f"[OK] Server is ready at http://localhost:{port}")
-    else:
-        print(f"[WARN] Server may not be ready yet (timeout). Check logs.")
-
-    # Step 9: Open browser
-    open_browser(port)
-
-    # Step 10: Keep running (Ctrl+C to stop)
-    signal.signal(signal.SIGINT, cleanup)
-    if hasattr(signal, "SIGTERM"):
-        signal.signal(signal.SIGTERM, cleanup)
-
-    print()
-    print("-" * 50)
-    print(f"  Server running at http://localhost:{port}")
-    print("  Press Ctrl+C to stop all services")
-    print("-" * 50)
-    print()
-
-    try:
-        while True:
-            if server_proc.poll() is not None:
-                print(f"[ERROR] Server process exited with code {server_proc.returncode}")
-                break
-            time.sleep(1)
-    except KeyboardInterrupt:
-        pass
-    finally:
-        cleanup()
+    # Step 8: Run the API server in-process, open the browser once it's
+    # listening, and block until Ctrl+C / SIGTERM
+    run_server(get_port())
 
 
 if __name__ == "__main__":
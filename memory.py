@@ -13,8 +13,12 @@ Stores:
 
 import sqlite3
 import json
+import atexit
 import logging
-from datetime import datetime, timedelta
+import queue
+import threading
+import weakref
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
@@ -23,28 +27,80 @@ log = logging.getLogger("memory")
 
 DB_PATH = Path(__file__).parent / "data" / "agent_memory.db"
 
+# Idle connections kept open per Memory instance. Checkouts beyond this open a
+# fresh connection (nested _conn() calls never block) that is closed on return.
+POOL_SIZE = 4
+
+# Conversation log writes are buffered and committed in one transaction once
+# LOG_BATCH_SIZE rows are pending or LOG_FLUSH_DELAY seconds have passed.
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_DELAY = 0.2
+
+# Mirrors the CHECK on conversations.role; checked when a row is queued so a
+# bad role fails in the caller instead of inside a later batch write
+CONVERSATION_ROLES = frozenset({"user", "assistant", "system"})
+
+_INSERT_CONVERSATION = """INSERT INTO conversations
+    (role, content, task_id, session_id, tokens_used, cost, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+# Instances with buffered conversation rows, flushed at interpreter exit
+_pending_logs: "weakref.WeakSet[Memory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_logs():
+    for mem in list(_pending_logs):
+        try:
+            mem.flush_conversations()
+        except Exception as e:
+            log.warning(f"Conversation log flush at exit failed: {e}")
+
 
 class Memory:
     def __init__(self, db_path: Path = DB_PATH):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bumped on every committed write from this process; lets callers
+        # cache derived views (e.g. the context summary) cheaply.
+        self.tasks_version = 0
+        self._pool: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._log_buf: list[tuple] = []
+        self._log_lock = threading.Lock()
+        self._log_timer: Optional[threading.Timer] = None
         self._init_db()
         self._embedding_store = None  # lazy init
 
-    @contextmanager
-    def _conn(self):
-        conn = sqlite3.connect(str(self.db_path))
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+
+    @contextmanager
+    def _conn(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        changes = conn.total_changes
         try:
             yield conn
             conn.commit()
+            if conn.total_changes != changes:
+                self.tasks_version += 1
         except Exception:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            if self._pool.qsize() < POOL_SIZE:
+                self._pool.put(conn)
+            else:
+                conn.close()
 
     def _init_db(self):
         with self._conn() as conn:
@@ -270,6 +326,30 @@ class Memory:
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def get_due_task_previews(self) -> list[dict]:
+        """Lightweight variant of get_due_tasks() for listings.
+
+        Returns only the displayed columns, with the JSON context minified and
+        truncated to a 200-char ``context_preview`` inside SQLite (NULL when
+        the context is empty), so callers never parse the full blob.
+        """
+        now = datetime.now().isoformat()
+        with self._conn() as conn:
+            rows = conn.execute(
+                """SELECT id, title, priority, description,
+                          CASE WHEN json_valid(context)
+                                AND json(context) NOT IN ('{}', '[]')
+                               THEN substr(json(context), 1, 200)
+                          END AS context_preview
+                   FROM tasks
+                   WHERE status = 'pending'
+                   AND next_run_at IS NOT NULL
+                   AND next_run_at <= ?
+                   ORDER BY priority ASC, next_run_at ASC""",
+                (now,),
+            ).fetchall()
+            return [dict(r) for r in rows]
+
     def get_next_due_time(self) -> Optional[datetime]:
         """Get the earliest next_run_at for pending tasks (for smart scheduler sleep)."""
         now = datetime.now().isoformat()
@@ -383,6 +463,7 @@ class Memory:
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID. Returns True if task existed and was deleted."""
+        self.flush_conversations()
         with self._conn() as conn:
             # Check if task exists
             task = self.get_task(task_id)
@@ -501,37 +582,95 @@ class Memory:
         session_id: str = None,
         tokens_used: int = 0,
         cost: float = 0,
-    ) -> int:
-        with self._conn() as conn:
-            cur = conn.execute(
-                """INSERT INTO conversations
-                   (role, content, task_id, session_id, tokens_used, cost)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (role, content, task_id, session_id, tokens_used, cost),
+    ) -> None:
+        """Queue a conversation row. Written by flush_conversations() in batches;
+        readers in this process flush first, so they always see it."""
+        if role not in CONVERSATION_ROLES:
+            raise ValueError(
+                f"Invalid conversation role {role!r} (expected one of: {', '.join(sorted(CONVERSATION_ROLES))})"
             )
-            conv_id = cur.lastrowid
-        self._embed_async("embed_conversation", conv_id, content)
-        return conv_id
+        # Same UTC format as the column default (datetime('now')), stamped at
+        # call time rather than at flush time
+        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        row = (role, content, task_id, session_id, tokens_used, cost, created_at)
+        with self._log_lock:
+            self._log_buf.append(row)
+            pending = len(self._log_buf)
+            if pending == 1:
+                _pending_logs.add(self)
+                self._log_timer = threading.Timer(LOG_FLUSH_DELAY, self.flush_conversations)
+                self._log_timer.daemon = True
+                self._log_timer.start()
+        if pending >= LOG_BATCH_SIZE:
+            self.flush_conversations()
+
+    def flush_conversations(self) -> None:
+        """Write all buffered conversation rows in a single transaction.
+
+        If the batch fails, rows are retried one at a time: rows the database
+        rejects are logged and dropped, and on any other error the unwritten
+        rows go back to the buffer for the next flush.
+        """
+        with self._log_lock:
+            if not self._log_buf:
+                return
+            batch, self._log_buf = self._log_buf, []
+            if self._log_timer is not None:
+                self._log_timer.cancel()
+                self._log_timer = None
+            try:
+                with self._conn() as conn:
+                    conn.executemany(_INSERT_CONVERSATION, batch)
+                    # AUTOINCREMENT ids within one write transaction are contiguous
+                    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                written = list(zip(range(last_id - len(batch) + 1, last_id + 1), batch))
+            except sqlite3.Error as e:
+                log.warning(f"Conversation batch of {len(batch)} failed ({e}); retrying row by row")
+                written = self._insert_conversations_one_by_one(batch)
+        for conv_id, row in written:
+            self._embed_async("embed_conversation", conv_id, row[1])
+
+    def _insert_conversations_one_by_one(self, rows: list[tuple]) -> list[tuple[int, tuple]]:
+        """Fallback for flush_conversations(); caller holds _log_lock."""
+        written = []
+        for i, row in enumerate(rows):
+            try:
+                with self._conn() as conn:
+                    written.append((conn.execute(_INSERT_CONVERSATION, row).lastrowid, row))
+            except sqlite3.IntegrityError as e:
+                log.error(f"Dropped conversation row (role={row[0]!r}, session={row[3]!r}): {e}")
+            except sqlite3.Error as e:
+                # Not this row's fault (locked/busy/IO) - keep the rest for later
+                log.warning(f"Conversation log write failed ({e}); {len(rows) - i} rows kept for retry")
+                self._log_buf[:0] = rows[i:]
+                _pending_logs.add(self)
+                self._log_timer = threading.Timer(LOG_FLUSH_DELAY, self.flush_conversations)
+                self._log_timer.daemon = True
+                self._log_timer.start()
+                break
+        return written
 
     def get_conversation_history(
         self, session_id: str = None, limit: int = 50
     ) -> list[dict]:
+        self.flush_conversations()
         with self._conn() as conn:
             if session_id:
                 rows = conn.execute(
                     """SELECT * FROM conversations 
                        WHERE session_id = ?
-                       ORDER BY created_at DESC LIMIT ?""",
+                       ORDER BY created_at DESC, id DESC LIMIT ?""",
                     (session_id, limit),
                 ).fetchall()
             else:
                 rows = conn.execute(
-                    "SELECT * FROM conversations ORDER BY created_at DESC LIMIT ?",
+                    "SELECT * FROM conversations ORDER BY created_at DESC, id DESC LIMIT ?",
                     (limit,),
                 ).fetchall()
             return [dict(r) for r in reversed(rows)]
 
     def get_task_conversations(self, task_id: int) -> list[dict]:
+        self.flush_conversations()
         with self._conn() as conn:
             rows = conn.execute(
                 "SELECT * FROM conversations WHERE task_id = ? ORDER BY created_at",
@@ -539,6 +678,20 @@ class Memory:
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def get_task_with_conversations(self, task_id: int) -> Optional[dict]:
+        """Task row plus its conversation log, read on one connection.
+        Returns None if the task doesn't exist."""
+        self.flush_conversations()
+        with self._conn() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if not row:
+                return None
+            rows = conn.execute(
+                "SELECT * FROM conversations WHERE task_id = ? ORDER BY created_at",
+                (task_id,),
+            ).fetchall()
+            return {"task": dict(row), "conversations": [dict(r) for r in rows]}
+
     # ─────────────────────────────────────────
     # Skills
     # ─────────────────────────────────────────
@@ -563,6 +716,16 @@ class Memory:
                 (name,),
             )
 
+    def record_skill_uses(self, names: list[str]) -> None:
+        """Batch form of record_skill_use: one transaction for many uses."""
+        with self._conn() as conn:
+            conn.executemany(
+                """UPDATE skills 
+                   SET use_count = use_count + 1, last_used_at = datetime('now')
+                   WHERE name = ?""",
+                [(name,) for name in names],
+            )
+
     def get_all_skills(self) -> list[dict]:
         with self._conn() as conn:
             rows = conn.execute(
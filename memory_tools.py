@@ -6,11 +6,31 @@ that the Claude agent can use autonomously.
 """
 
 import json
+import time
 from claude_agent_sdk import tool
 from memory import Memory
 
+try:
+    import orjson
+
+    def _dumps(obj, indent: bool = False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional — fall back to stdlib json
+    def _dumps(obj, indent: bool = False) -> str:
+        return json.dumps(obj, indent=2 if indent else None)
+
+    _loads = json.loads
+
 memory = Memory()
 
+# (memory.tasks_version, monotonic timestamp, summary) of the last full context.
+# Any write through `memory` bumps the version; the TTL bounds staleness from
+# writes made by other processes (daemon, CLI).
+_CTX_CACHE_TTL = 5.0
+_ctx_cache: tuple[int, float, str] | None = None
+
 
 # ─────────────────────────────────────────────────────────
 # Task Management Tools
@@ -36,8 +56,8 @@ async def memory_add_task(args):
     context = {}
     if args.get("context"):
         try:
-            context = json.loads(args["context"])
-        except json.JSONDecodeError:
+            context = _loads(args["context"])
+        except ValueError:
             context = {"raw": args["context"]}
 
     task_id = memory.add_task(
@@ -85,7 +105,7 @@ async def memory_get_pending_tasks(args):
     {}
 )
 async def memory_get_due_tasks(args):
-    tasks = memory.get_due_tasks()
+    tasks = memory.get_due_task_previews()
     if not tasks:
         return {"content": [{"type": "text", "text": "No tasks due right now."}]}
 
@@ -96,9 +116,8 @@ async def memory_get_due_tasks(args):
         )
         if t.get("description"):
             lines.append(f"   {t['description'][:150]}")
-        ctx = json.loads(t.get("context", "{}"))
-        if ctx:
-            lines.append(f"   Context: {json.dumps(ctx)[:200]}")
+        if t.get("context_preview"):
+            lines.append(f"   Context: {t['context_preview']}")
     return {"content": [{"type": "text", "text": "\n".join(lines)}]}
 
 
@@ -253,7 +272,7 @@ async def memory_kv_get(args):
     value = memory.kv_get(args["key"])
     if value is None:
         return {"content": [{"type": "text", "text": f"Key '{args['key']}' not found."}]}
-    return {"content": [{"type": "text", "text": f"{args['key']} = {json.dumps(value)}"}]}
+    return {"content": [{"type": "text", "text": f"{args['key']} = {_dumps(value)}"}]}
 
 
 # ─────────────────────────────────────────────────────────
@@ -270,7 +289,14 @@ async def memory_kv_get(args):
     {}
 )
 async def memory_get_full_context(args):
-    context = memory.build_context_summary()
+    global _ctx_cache
+    now = time.monotonic()
+    cached = _ctx_cache
+    if cached and cached[0] == memory.tasks_version and now - cached[1] < _CTX_CACHE_TTL:
+        context = cached[2]
+    else:
+        context = memory.build_context_summary()
+        _ctx_cache = (memory.tasks_version, now, context)
     return {"content": [{"type": "text", "text": context}]}
 
 
@@ -285,7 +311,7 @@ async def memory_get_full_context(args):
 )
 async def memory_get_stats(args):
     stats = memory.get_task_stats()
-    return {"content": [{"type": "text", "text": json.dumps(stats, indent=2)}]}
+    return {"content": [{"type": "text", "text": _dumps(stats, indent=True)}]}
 
 
 # ─────────────────────────────────────────────────────────
@@ -7,8 +7,11 @@ Creates/updates config.yaml with API keys, provider preference, and settings.
 
 Usage:
     python setup_wizard.py
+    python setup_wizard.py --answers answers.yaml     # non-interactive: YAML/JSON mapping of config keys
+    python setup_wizard.py --from-stdin < answers.yaml
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -34,17 +37,46 @@ def prompt_value(label: str, current: str = "", secret: bool = False, default: s
     return val
 
 
-def main():
-    print()
-    print("=" * 50)
-    print("  AgelClaw Agent — Setup Wizard")
-    print("=" * 50)
-    print()
-    print(f"Config file: {CONFIG_PATH}")
-    print()
+# Numeric settings and their types (applied to prompted and piped values alike)
+_NUMERIC_KEYS = {
+    "api_port": int,
+    "daemon_port": int,
+    "cost_limit_daily": float,
+    "max_concurrent_tasks": int,
+    "check_interval": int,
+}
+
+
+def apply_piped_config(config: dict, text: str) -> None:
+    """Non-interactive setup: apply all answers at once from YAML (or JSON) text."""
+    import yaml
+
+    try:
+        answers = yaml.safe_load(text) or {}
+    except yaml.YAMLError as e:
+        print(f"  ERROR: answers are not valid YAML/JSON: {e}")
+        sys.exit(1)
+    if not isinstance(answers, dict):
+        print("  ERROR: expected a YAML/JSON mapping of config keys")
+        sys.exit(1)
+    config.update(answers)
+    for key, type_fn in _NUMERIC_KEYS.items():
+        if config.get(key) not in (None, ""):
+            try:
+                config[key] = type_fn(config[key])
+            except (TypeError, ValueError):
+                print(f"  ERROR: {key} must be {'an integer' if type_fn is int else 'a number'}, got {config[key]!r}")
+                sys.exit(1)
+    if config.get("default_provider") not in ("claude", "openai", "auto"):
+        config["default_provider"] = "claude"
 
-    # Load existing config
-    config = load_config()
+
+def prompt_all(config: dict) -> None:
+    """Interactive setup: walk through every section."""
+    try:
+        import readline  # noqa: F401 — line editing + history for input()
+    except ImportError:
+        pass  # not available on Windows
 
     # Step 1: API Keys
     print("1. API Keys")
@@ -132,6 +164,39 @@ def main():
         default="300",
     ))
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Configure the agent system (config.yaml)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--answers", metavar="FILE",
+                        help="Apply answers from a YAML/JSON file instead of prompting")
+    source.add_argument("--from-stdin", action="store_true",
+                        help="Apply answers read from stdin (YAML/JSON) instead of prompting")
+    args = parser.parse_args()
+
+    print()
+    print("=" * 50)
+    print("  AgelClaw Agent — Setup Wizard")
+    print("=" * 50)
+    print()
+    print(f"Config file: {CONFIG_PATH}")
+    print()
+
+    # Load existing config
+    config = load_config()
+
+    if args.answers:
+        try:
+            text = Path(args.answers).read_text(encoding="utf-8")
+        except OSError as e:
+            print(f"  ERROR: cannot read answers file: {e}")
+            sys.exit(1)
+        apply_piped_config(config, text)
+    elif args.from_stdin:
+        apply_piped_config(config, sys.stdin.read())
+    else:
+        prompt_all(config)
+
     # Save
     save_config(config)
     print()
@@ -20,13 +20,90 @@ Tools:
   update_skill_body      - Update SKILL.md body preserving frontmatter
 """
 
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import io
+import mmap
 import os
+import pickle
 import re
+import tempfile
+import threading
+from collections import Counter
 from pathlib import Path
+
+import yaml
 from claude_agent_sdk import tool
-from memory import Memory
 
-memory = Memory()
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper  # libyaml
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+_mem = None
+
+
+def _memory():
+    """Memory is only needed for usage stats/registration — open the DB on first use."""
+    global _mem
+    if _mem is None:
+        from memory import Memory
+        _mem = Memory()
+    return _mem
+
+
+# Skill usage counts are queued and written in batches off the tool's
+# request path. The queue belongs to the running loop; anything left when
+# a loop goes away (e.g. mem_cli's asyncio.run) is flushed synchronously.
+_usage_queue: asyncio.Queue | None = None
+_usage_drainer: asyncio.Task | None = None
+
+
+def _flush_usage_queue():
+    if _usage_queue is None:
+        return
+    batch = []
+    while True:
+        try:
+            batch.append(_usage_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    if batch:
+        _memory().record_skill_uses(batch)
+
+
+atexit.register(_flush_usage_queue)
+
+
+async def _drain_usage_queue(q: asyncio.Queue):
+    while True:
+        batch = [await q.get()]
+        while True:
+            try:
+                batch.append(q.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        try:
+            await asyncio.to_thread(_memory().record_skill_uses, batch)
+        except Exception:
+            pass  # usage stats are best-effort
+
+
+def _record_skill_use(name: str):
+    """Queue a usage-count bump for a skill (non-blocking)."""
+    global _usage_queue, _usage_drainer
+    loop = asyncio.get_running_loop()
+    if _usage_drainer is None or _usage_drainer.done() or _usage_drainer.get_loop() is not loop:
+        _flush_usage_queue()
+        _usage_queue = asyncio.Queue(maxsize=1024)
+        _usage_drainer = loop.create_task(_drain_usage_queue(_usage_queue))
+    try:
+        _usage_queue.put_nowait(name)
+    except asyncio.QueueFull:
+        _memory().record_skill_use(name)
+
 
 # ─────────────────────────────────────────────────────────
 # Paths
@@ -40,20 +117,44 @@ ALL_SKILL_DIRS = [PROJECT_SKILLS_DIR, USER_SKILLS_DIR]
 # Valid skill name: lowercase, digits, hyphens, max 64 chars
 SKILL_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9\-]{0,62}[a-z0-9]$|^[a-z0-9]$")
 
+# SKILL.md written by create_full_skill (single-line descriptions)
+_SKILL_MD_TEMPLATE = "---\nname: {name}\ndescription: >-\n  {desc}\n---\n\n{body}\n"
+
+# Keyword tokens for skill matching (lowercased per token, not per text)
+_TOK_RE = re.compile(r"[A-Za-z0-9]+")
+
 
 # ─────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────
 
-def _parse_frontmatter(content: str):
-    """Parse YAML frontmatter from SKILL.md. Returns (name, description)."""
-    if not content.startswith("---"):
+def _parse_frontmatter(content: str | bytes):
+    """Parse YAML frontmatter from SKILL.md. Returns (name, description).
+    Accepts raw bytes too, in which case only the frontmatter slice is decoded."""
+    is_bytes = isinstance(content, bytes)
+    if not content.startswith(b"---" if is_bytes else "---"):
         return None, None
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    end = content.find(b"\n---" if is_bytes else "\n---", 3)
+    if end < 0:
         return None, None
+    frontmatter = content[3:end]
+    try:
+        meta = yaml.load(frontmatter, Loader=_YamlLoader)
+    except yaml.YAMLError:
+        meta = None
+    if not isinstance(meta, dict):
+        if is_bytes:
+            frontmatter = frontmatter.decode("utf-8", errors="replace")
+        return _parse_frontmatter_lines(frontmatter)
+    name, desc = meta.get("name"), meta.get("description")
+    return (str(name) if name is not None else None,
+            str(desc).strip() if desc is not None else None)
+
+
+def _parse_frontmatter_lines(frontmatter: str):
+    """Line-based fallback for frontmatter that isn't valid YAML."""
     name = desc = None
-    for line in parts[1].strip().split("\n"):
+    for line in frontmatter.strip().split("\n"):
         if line.startswith("name:"):
             name = line.split(":", 1)[1].strip().strip("'\"")
         elif line.startswith("description:"):
@@ -61,30 +162,285 @@ def _parse_frontmatter(content: str):
     return name, desc
 
 
+# SKILL.md parse cache: path -> (mtime_ns, size, content, name, description, tokens)
+_SKILL_CACHE: dict[Path, tuple[int, int, str, str | None, str | None, set[str]]] = {}
+
+
+def _load_skill(sm: Path) -> tuple[str, str | None, str | None, set[str]]:
+    """Read + parse a SKILL.md, reusing the cached result while its mtime/size are unchanged.
+    Returns (content, name, description, tokens); tokens cover name + description + body."""
+    st = sm.stat()
+    cached = _SKILL_CACHE.get(sm)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2:]
+    content = sm.read_text(encoding="utf-8")
+    name, desc = _parse_frontmatter(content)
+    tokens = _tokenize(f"{name or sm.parent.name} {desc or ''} {content}")
+    _SKILL_CACHE[sm] = (st.st_mtime_ns, st.st_size, content, name, desc, tokens)
+    return content, name, desc, tokens
+
+
+# Inverted index for find_skill_for_task, reconciled against SKILL.md stats on
+# every query. Skills are keyed by their directory path.
+_INDEX: dict = {
+    "token2skills": {},  # token -> set of skill dir paths
+    "skill_tokens": {},  # skill dir path -> token set
+    "mtime": {},         # SKILL.md path -> (mtime_ns, size) at index time
+}
+# Content version _INDEX currently reflects (persisted as .skill_index.<version>.pkl)
+_INDEX_VERSION: str | None = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _index_remove(skill_id: str):
+    token2skills = _INDEX["token2skills"]
+    for t in _INDEX["skill_tokens"].pop(skill_id, ()):
+        postings = token2skills.get(t)
+        if postings is not None:
+            postings.discard(skill_id)
+            if not postings:
+                del token2skills[t]
+
+
+def _index_cache_path(version: str) -> Path:
+    return PROJECT_ROOT / ".Claude" / f".skill_index.{version}.pkl"
+
+
+def _load_index_cache(version: str) -> bool:
+    """Populate _INDEX from the on-disk cache for this content version, if present."""
+    try:
+        with open(_index_cache_path(version), "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return False
+    _INDEX.update(cached)
+    return True
+
+
+def _save_index_cache(version: str):
+    """Write _INDEX for this content version and drop caches of older versions."""
+    path = _index_cache_path(version)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(".skill_index.*.pkl"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(_INDEX, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is best-effort
+
+
+def _refresh_index_locked() -> dict[str, Path]:
+    """Bring _INDEX in line with the skill dirs. Returns {skill_id: SKILL.md path}
+    in scan order (project skills first). Caller must hold _INDEX_LOCK."""
+    global _INDEX_VERSION
+    found: list[tuple[str, Path, tuple[int, int]]] = []
+    for base in ALL_SKILL_DIRS:
+        if not base.exists():
+            continue
+        with os.scandir(base) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                sm = Path(entry.path) / "SKILL.md"
+                try:
+                    st = sm.stat()
+                except OSError:
+                    continue
+                found.append((entry.path, sm, (st.st_mtime_ns, st.st_size)))
+
+    # Content version = hash of every SKILL.md's path, mtime and size
+    version = hashlib.blake2b(
+        b"".join(f"{sm}:{m}:{n}\n".encode() for _, sm, (m, n) in sorted(found)),
+        digest_size=16,
+    ).hexdigest()
+    if version == _INDEX_VERSION:
+        return {skill_id: sm for skill_id, sm, _ in found}
+    if not _INDEX["skill_tokens"] and _load_index_cache(version):
+        _INDEX_VERSION = version
+        return {skill_id: sm for skill_id, sm, _ in found}
+
+    seen: dict[str, Path] = {}
+    mtimes = _INDEX["mtime"]
+    for skill_id, sm, stamp in found:
+        seen[skill_id] = sm
+        if mtimes.get(sm) == stamp:
+            continue
+        _index_remove(skill_id)
+        _, _, _, tokens = _load_skill(sm)
+        _INDEX["skill_tokens"][skill_id] = tokens
+        for t in tokens:
+            _INDEX["token2skills"].setdefault(t, set()).add(skill_id)
+        mtimes[sm] = stamp
+
+    for skill_id in [sid for sid in _INDEX["skill_tokens"] if sid not in seen]:
+        _index_remove(skill_id)
+        mtimes.pop(Path(skill_id) / "SKILL.md", None)
+
+    _INDEX_VERSION = version
+    _save_index_cache(version)
+    return seen
+
+
+def _score_task(task_tokens: set[str]) -> tuple[dict[str, Path], str | None, int]:
+    """Refresh the index and pick the best skill for task_tokens under one hold of
+    _INDEX_LOCK, so scoring never walks postings another thread is updating.
+    Returns (skills, best skill_id or None, overlap with the task tokens)."""
+    with _INDEX_LOCK:
+        skills = _refresh_index_locked()
+
+        # Score = overlap / task_tokens size, summed from postings so only skills
+        # sharing at least one token with the task are considered. Tokens every
+        # skill contains ("the", "file", ...) add the same +1 to all of them, so
+        # they are counted once up front instead of walking their postings.
+        token2skills = _INDEX["token2skills"]
+        n_skills = len(skills)
+        shared = 0
+        counts = Counter()
+        for t in task_tokens:
+            postings = token2skills.get(t)
+            if not postings:
+                continue
+            if n_skills > 1 and len(postings) == n_skills:
+                shared += 1
+                continue
+            for skill_id in postings:
+                counts[skill_id] += 1
+    if shared and not counts:
+        counts[next(iter(skills))] = 0
+    if not counts:
+        return skills, None, 0
+
+    # Highest integer overlap wins; ties go to the skill found first in scan
+    # order (counts is filled in set order, which varies between processes).
+    # Walking in scan order, the first skill covering every task token can't
+    # be beaten or tied by an earlier one, so stop there.
+    n_task = len(task_tokens)
+    best_id = None
+    best_count = -1
+    for skill_id in skills:
+        count = counts.get(skill_id)
+        if count is None or count <= best_count:
+            continue
+        best_id, best_count = skill_id, count
+        if count + shared == n_task:
+            break
+    return skills, best_id, best_count + shared
+
+
+# Skill name -> directory, rebuilt when a base skills dir's mtime changes
+# (i.e. a skill dir was added, removed or renamed)
+_SKILL_DIR_MAP: dict[str, Path] = {}
+_SKILL_DIR_MAP_MTIME: dict[Path, int | None] = {}
+
+
 def _find_skill_dir(skill_name: str) -> Path | None:
     """Find a skill directory by name across all skill dirs."""
+    mtimes = {}
     for base in ALL_SKILL_DIRS:
-        candidate = base / skill_name
-        if candidate.is_dir() and (candidate / "SKILL.md").exists():
-            return candidate
-    return None
+        try:
+            mtimes[base] = base.stat().st_mtime_ns
+        except OSError:
+            mtimes[base] = None
+    if mtimes != _SKILL_DIR_MAP_MTIME:
+        _SKILL_DIR_MAP.clear()
+        for base in ALL_SKILL_DIRS:
+            if mtimes[base] is None:
+                continue
+            with os.scandir(base) as it:
+                for entry in it:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "SKILL.md")):
+                        # Earlier dirs (project) win over later ones (user)
+                        _SKILL_DIR_MAP.setdefault(entry.name, Path(entry.path))
+        _SKILL_DIR_MAP_MTIME.clear()
+        _SKILL_DIR_MAP_MTIME.update(mtimes)
+    return _SKILL_DIR_MAP.get(skill_name)
 
 
 def _count_resources(skill_dir: Path) -> dict:
     """Count scripts, references, and assets in a skill dir."""
     counts = {}
     for subdir in ("scripts", "references", "assets"):
-        d = skill_dir / subdir
-        if d.is_dir():
-            counts[subdir] = len([f for f in d.iterdir() if f.is_file()])
-        else:
+        try:
+            with os.scandir(skill_dir / subdir) as it:
+                counts[subdir] = sum(1 for e in it if e.is_file())
+        except (FileNotFoundError, NotADirectoryError):
             counts[subdir] = 0
     return counts
 
 
+def _read_frontmatter_only(path: Path) -> bytes:
+    """Read SKILL.md only up to the end of its frontmatter (the closing '---').
+    The file is mmapped, so only the pages holding the frontmatter are touched.
+    Falls back to the whole file if there is no closing marker. Returns the raw
+    bytes; _parse_frontmatter decodes only what it needs."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""  # empty file — nothing to map
+        with mm:
+            if mm[:3] != b"---":
+                return b""
+            end = mm.find(b"\n---", 3)
+            return mm[:] if end < 0 else mm[:end + 4]
+    finally:
+        os.close(fd)
+
+
+def _skill_frontmatter(sm: Path) -> tuple[str | None, str | None]:
+    """(name, description) for listings — from the parse cache when fresh,
+    otherwise from the frontmatter bytes alone."""
+    st = sm.stat()
+    cached = _SKILL_CACHE.get(sm)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[3], cached[4]
+    return _parse_frontmatter(_read_frontmatter_only(sm))
+
+
 def _tokenize(text: str) -> set[str]:
     """Simple tokenizer for keyword matching."""
-    return set(re.findall(r"[a-z0-9]+", text.lower()))
+    return {m.group().lower() for m in _TOK_RE.finditer(text)}
+
+
+def _describe_skill(sd: Path, location: str) -> dict | None:
+    """Listing entry for one skill dir, or None if it has no SKILL.md."""
+    try:
+        name, desc = _skill_frontmatter(sd / "SKILL.md")
+    except FileNotFoundError:
+        return None
+    return {
+        "name": name or sd.name,
+        "description": desc or "",
+        "location": location,
+        "path": str(sd),
+        **_count_resources(sd),
+    }
+
+
+def _write_bytes_atomic(path: Path, data: bytes, mode: int = 0o644):
+    """Write data to path via a temp file + rename, so readers never see a partial file.
+    The temp file is unique per call (concurrent writers never share it) and gets
+    its permission bits via fchmod on POSIX; it is removed if the write fails."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
 
 
 def _ok(text: str) -> dict:
@@ -103,28 +459,26 @@ def _err(text: str) -> dict:
 
 @tool("list_installed_skills", "List all installed Agent Skills with resource counts (scripts, references, assets).", {})
 async def list_installed_skills(args):
-    skills = []
+    candidates = []
     for base in ALL_SKILL_DIRS:
         if not base.exists():
             continue
-        for sd in sorted(base.iterdir()):
-            sm = sd / "SKILL.md"
-            if sd.is_dir() and sm.exists():
-                name, desc = _parse_frontmatter(sm.read_text(encoding="utf-8"))
-                counts = _count_resources(sd)
-                location = "project" if base == PROJECT_SKILLS_DIR else "user"
-                skills.append({
-                    "name": name or sd.name,
-                    "description": desc or "",
-                    "location": location,
-                    "path": str(sd),
-                    **counts,
-                })
+        location = "project" if base == PROJECT_SKILLS_DIR else "user"
+        with os.scandir(base) as it:
+            entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        candidates.extend((Path(entry.path), location) for entry in entries)
+
+    # Read frontmatter + count resources for all skills concurrently, off the event loop
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_describe_skill, sd, location) for sd, location in candidates)
+    )
+    skills = [r for r in results if r is not None]
 
     if not skills:
         return _ok("No skills installed.")
 
-    lines = []
+    buf = io.StringIO()
+    buf.write(f"## Installed Skills ({len(skills)})\n")
     for s in skills:
         res_parts = []
         if s["scripts"]:
@@ -134,9 +488,9 @@ async def list_installed_skills(args):
         if s["assets"]:
             res_parts.append(f"{s['assets']} assets")
         res_str = f" ({', '.join(res_parts)})" if res_parts else ""
-        lines.append(f"- **{s['name']}** [{s['location']}]{res_str}: {s['description'][:100]}")
+        buf.write(f"\n- **{s['name']}** [{s['location']}]{res_str}: {s['description'][:100]}")
 
-    return _ok(f"## Installed Skills ({len(skills)})\n\n" + "\n".join(lines))
+    return _ok(buf.getvalue())
 
 
 @tool(
@@ -157,46 +511,26 @@ async def find_skill_for_task(args):
     if not task_tokens:
         return _ok("No matching skill found.")
 
-    best_match = None
-    best_score = 0.0
-
-    for base in ALL_SKILL_DIRS:
-        if not base.exists():
-            continue
-        for sd in base.iterdir():
-            sm = sd / "SKILL.md"
-            if not (sd.is_dir() and sm.exists()):
-                continue
-            content = sm.read_text(encoding="utf-8")
-            name, desc = _parse_frontmatter(content)
-            skill_name = name or sd.name
-            skill_desc = desc or ""
-
-            # Build skill tokens from name + description + body
-            skill_text = f"{skill_name} {skill_desc} {content}"
-            skill_tokens = _tokenize(skill_text)
-
-            if not skill_tokens:
-                continue
+    skills, best_id, best_overlap = await asyncio.to_thread(_score_task, task_tokens)
+    n_task = len(task_tokens)
 
-            # Jaccard-like overlap: intersection / task_tokens size
-            overlap = len(task_tokens & skill_tokens)
-            score = overlap / len(task_tokens)
-
-            if score > best_score:
-                best_score = score
-                best_match = {
-                    "name": skill_name,
-                    "description": skill_desc,
-                    "score": round(score, 3),
-                    "path": str(sd),
-                    "content": content,
-                }
+    best_match = None
+    best_score = best_overlap / n_task
+    if best_id is not None:
+        sm = skills[best_id]
+        content, name, desc, _ = await asyncio.to_thread(_load_skill, sm)
+        best_match = {
+            "name": name or sm.parent.name,
+            "description": desc or "",
+            "score": round(best_score, 3),
+            "path": best_id,
+            "content": content,
+        }
 
     if best_match and best_score > 0.2:
         counts = _count_resources(Path(best_match["path"]))
         # Record usage in memory
-        memory.record_skill_use(best_match["name"])
+        _record_skill_use(best_match["name"])
         return _ok(
             f"## Matching Skill Found: {best_match['name']} (score: {best_match['score']})\n\n"
             f"**Path:** {best_match['path']}\n"
@@ -222,28 +556,26 @@ async def get_skill_content(args):
     if not skill_dir:
         return _err(f"Skill '{skill_name}' not found.")
 
-    content = (skill_dir / "SKILL.md").read_text(encoding="utf-8")
-    counts = _count_resources(skill_dir)
+    content = await asyncio.to_thread((skill_dir / "SKILL.md").read_text, encoding="utf-8")
 
-    # List actual files in each subdir
-    resources = {}
+    # List actual files in each subdir (one scan gives both names and counts)
+    counts = {}
+    res_buf = io.StringIO()
     for subdir in ("scripts", "references", "assets"):
-        d = skill_dir / subdir
-        if d.is_dir():
-            resources[subdir] = [f.name for f in sorted(d.iterdir()) if f.is_file()]
-        else:
-            resources[subdir] = []
-
-    res_lines = []
-    for subdir, files in resources.items():
+        try:
+            with os.scandir(skill_dir / subdir) as it:
+                files = sorted(e.name for e in it if e.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            files = []
+        counts[subdir] = len(files)
         if files:
-            res_lines.append(f"\n### {subdir}/")
+            res_buf.write(f"\n\n### {subdir}/" if res_buf.tell() else f"\n### {subdir}/")
             for f in files:
-                res_lines.append(f"- {f}")
+                res_buf.write(f"\n- {f}")
 
-    resources_text = "\n".join(res_lines) if res_lines else "\n(no resources)"
+    resources_text = res_buf.getvalue() or "\n(no resources)"
 
-    memory.record_skill_use(skill_name)
+    _record_skill_use(skill_name)
     return _ok(
         f"## Skill: {skill_name}\n\n"
         f"**Path:** {skill_dir}\n"
@@ -305,18 +637,17 @@ async def create_full_skill(args):
     (skill_dir / "references").mkdir(exist_ok=True)
 
     # Write SKILL.md with YAML frontmatter
-    skill_md = f"""---
-name: {name}
-description: >-
-  {description}
----
-
-{body}
-"""
-    (skill_dir / "SKILL.md").write_text(skill_md, encoding="utf-8")
+    if "\n" in description:
+        # A multi-line description would break the folded scalar's indentation
+        frontmatter = yaml.dump({"name": name, "description": description},
+                                Dumper=_YamlDumper, sort_keys=False, allow_unicode=True)
+        skill_md = f"---\n{frontmatter}---\n\n{body}\n"
+    else:
+        skill_md = _SKILL_MD_TEMPLATE.format_map({"name": name, "desc": description, "body": body})
+    _write_bytes_atomic(skill_dir / "SKILL.md", skill_md.encode("utf-8"))
 
     # Register in Memory SQLite
-    memory.register_skill(name, description, str(skill_dir), location)
+    _memory().register_skill(name, description, str(skill_dir), location)
 
     return _ok(
         f"Skill '{name}' created at {skill_dir}\n\n"
@@ -366,12 +697,8 @@ async def add_skill_script(args):
     scripts_dir = skill_dir / "scripts"
     scripts_dir.mkdir(exist_ok=True)
 
-    script_path = scripts_dir / filename
-    script_path.write_text(content, encoding="utf-8")
-
-    # Set executable on Unix
-    if os.name != "nt":
-        os.chmod(script_path, 0o755)
+    # Executable on Unix (mode is ignored on Windows)
+    _write_bytes_atomic(scripts_dir / filename, content.encode("utf-8"), mode=0o755)
 
     return _ok(f"Script '{filename}' added to {skill_name}/scripts/ ({len(content)} bytes)")
 
@@ -412,8 +739,7 @@ async def add_skill_reference(args):
     refs_dir = skill_dir / "references"
     refs_dir.mkdir(exist_ok=True)
 
-    ref_path = refs_dir / filename
-    ref_path.write_text(content, encoding="utf-8")
+    _write_bytes_atomic(refs_dir / filename, content.encode("utf-8"))
 
     return _ok(f"Reference '{filename}' added to {skill_name}/references/ ({len(content)} bytes)")
 
@@ -456,7 +782,7 @@ async def update_skill_body(args):
     else:
         updated = f"{new_body}\n"
 
-    skill_md.write_text(updated, encoding="utf-8")
+    _write_bytes_atomic(skill_md, updated.encode("utf-8"))
 
     return _ok(f"SKILL.md body updated for '{skill_name}' ({len(new_body)} chars)")
 
@@ -3,6 +3,10 @@ Parallel Review — 3 Subagents
 ===============================
 Security scanner + test runner + style checker running in parallel.
 
+Each reviewer gets its own query() call, so the three run concurrently and
+the review takes as long as the slowest one, not the sum of all three.
+Results are printed as each reviewer finishes.
+
 Usage:
     pip install claude-agent-sdk
     python parallel_review.py
@@ -12,56 +16,77 @@ import asyncio
 from claude_agent_sdk import query, ClaudeAgentOptions, AgentDefinition
 
 
-async def main():
-    async for message in query(
-        prompt="Do a comprehensive review of the project: security, tests, and style",
-        options=ClaudeAgentOptions(
-            allowed_tools=["Read", "Grep", "Glob", "Bash", "Task"],
-            agents={
-                "security-scanner": AgentDefinition(
-                    description="Security vulnerability scanner. Use for security analysis.",
-                    prompt="""You are a security expert. Analyze code for:
+REVIEWERS = {
+    "security-scanner": AgentDefinition(
+        description="Security vulnerability scanner. Use for security analysis.",
+        prompt="""You are a security expert. Analyze code for:
 - SQL injection, XSS, CSRF vulnerabilities
 - Hardcoded secrets and credentials
 - Insecure dependencies
 - Authentication/authorization flaws
 Provide severity ratings and remediation steps.""",
-                    tools=["Read", "Grep", "Glob"],
-                    model="sonnet",
-                ),
-                "test-runner": AgentDefinition(
-                    description="Test execution specialist. Use to run and analyze test suites.",
-                    prompt="""Run tests and analyze results:
+        tools=["Read", "Grep", "Glob"],
+        model="sonnet",
+    ),
+    "test-runner": AgentDefinition(
+        description="Test execution specialist. Use to run and analyze test suites.",
+        prompt="""Run tests and analyze results:
 - Execute test suites
 - Identify failing tests and root causes
 - Check coverage gaps
 - Suggest missing test cases""",
-                    tools=["Bash", "Read", "Grep"],
-                    model="sonnet",
-                ),
-                "style-checker": AgentDefinition(
-                    description="Code style and linting specialist. Use for style/formatting issues.",
-                    prompt="""Check code quality:
+        tools=["Bash", "Read", "Grep"],
+        model="sonnet",
+    ),
+    "style-checker": AgentDefinition(
+        description="Code style and linting specialist. Use for style/formatting issues.",
+        prompt="""Check code quality:
 - Naming conventions and consistency
 - Code formatting and structure
 - Documentation completeness
 - Dead code and unused imports""",
-                    tools=["Read", "Grep", "Glob"],
-                    model="haiku",  # lighter model for style checks
-                ),
-            },
+        tools=["Read", "Grep", "Glob"],
+        model="haiku",  # lighter model for style checks
+    ),
+}
+
+FOCUS = {
+    "security-scanner": "security",
+    "test-runner": "tests",
+    "style-checker": "style",
+}
+
+
+async def run_reviewer(name: str, agent: AgentDefinition) -> tuple[str, str]:
+    """Run one reviewer in its own query stream and return (name, result)."""
+    result = ""
+    async for message in query(
+        prompt=f"Use the {name} agent to review the project's {FOCUS[name]}",
+        options=ClaudeAgentOptions(
+            allowed_tools=["Read", "Grep", "Glob", "Bash", "Task"],
+            agents={name: agent},
         ),
     ):
-        # Track subagent invocations
-        if hasattr(message, "content") and message.content:
-            for block in message.content:
-                if getattr(block, "type", None) == "tool_use" and block.name == "Task":
-                    agent_type = block.input.get("subagent_type", "unknown")
-                    print(f"\n>>> Spawning subagent: {agent_type}")
-
         if hasattr(message, "result"):
-            print(f"\n{'='*60}")
-            print(message.result)
+            result = message.result
+    return name, result
+
+
+async def main():
+    print(f">>> Spawning subagents: {', '.join(REVIEWERS)}")
+    pending = [run_reviewer(name, agent) for name, agent in REVIEWERS.items()]
+
+    # Print each review as soon as its reviewer finishes
+    results = {}
+    for next_done in asyncio.as_completed(pending):
+        name, result = await next_done
+        results[name] = result
+        print(f"\n{'='*60}")
+        print(f"[{name}]")
+        print(result)
+
+    print(f"\n{'='*60}")
+    print(f"Review complete: {len(results)} reports ({', '.join(results)})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""
+Microsoft Graph JSON $batch helper
+==================================
+Shared by send_email.py and read_emails.py (not a command-line script). Callers
+pass in their authenticated HTTP client and their JSON body encoder.
+"""
+
+import time
+
+BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+
+# Graph accepts at most 20 sub-requests per $batch call
+BATCH_LIMIT = 20
+# Sub-requests Graph throttles individually, retried after their Retry-After
+THROTTLE_STATUS = (429, 503)
+BATCH_RETRIES = 3
+
+
+def retry_after(headers: dict | None, attempt: int) -> float:
+    """Seconds to wait from a Retry-After header, else exponential backoff."""
+    for key, value in (headers or {}).items():
+        if key.lower() == "retry-after":
+            try:
+                return min(float(value), 120.0)
+            except (TypeError, ValueError):
+                break
+    return float(2 ** attempt)
+
+
+def post_batch(session, reqs: list, json_body) -> tuple[list, float]:
+    """POST one $batch; returns ({"status", "body"} per request, seconds to wait before a retry)."""
+    payload = {"requests": []}
+    for i, r in enumerate(reqs):
+        sub = {"id": str(i), "method": r["method"], "url": r["url"]}
+        if r.get("body") is not None:
+            sub["body"] = r["body"]
+            sub["headers"] = {"Content-Type": "application/json", **r.get("headers", {})}
+        elif r.get("headers"):
+            sub["headers"] = r["headers"]
+        payload["requests"].append(sub)
+
+    resp = session.post(BATCH_URL, **json_body(payload), timeout=60)
+    if resp.status_code != 200:
+        error = {"status": resp.status_code, "body": {"error": resp.text[:500]}}
+        return [error for _ in reqs], retry_after(dict(resp.headers), 0)
+
+    by_id = {r["id"]: r for r in resp.json().get("responses", [])}
+    results, wait = [], 0.0
+    for i in range(len(reqs)):
+        r = by_id.get(str(i), {})
+        results.append({"status": r.get("status", 0), "body": r.get("body")})
+        if r.get("status") in THROTTLE_STATUS:
+            wait = max(wait, retry_after(r.get("headers"), 0))
+    return results, wait
+
+
+def run_batch(session, reqs: list, json_body, batch_size: int = BATCH_LIMIT) -> list:
+    """Run Graph requests through the JSON $batch endpoint, batch_size per round trip.
+
+    Each request is a dict with "method" and a v1.0-relative "url", plus optional
+    "headers" and "body". Returns one {"status", "body"} dict per request, in order.
+    Sub-requests throttled with 429/503 are resent after their Retry-After,
+    up to BATCH_RETRIES times.
+    """
+    responses = [None] * len(reqs)
+    for start in range(0, len(reqs), batch_size):
+        pending = list(range(start, min(start + batch_size, len(reqs))))
+        for attempt in range(BATCH_RETRIES + 1):
+            results, wait = post_batch(session, [reqs[i] for i in pending], json_body)
+            throttled = []
+            for i, r in zip(pending, results):
+                responses[i] = r
+                if r["status"] in THROTTLE_STATUS:
+                    throttled.append(i)
+            if not throttled or attempt == BATCH_RETRIES:
+                break
+            time.sleep(wait or 2 ** attempt)
+            pending = throttled
+    return responses
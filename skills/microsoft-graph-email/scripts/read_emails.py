@@ -10,15 +10,26 @@ Usage:
     python read_emails.py --folder sent --count 5  # Latest 5 sent emails
     python read_emails.py --search "invoice"       # Search inbox
     python read_emails.py --id AAMkAG...           # Read specific email
+    python read_emails.py --id AAMkAG... --preview # Same, ~255-char plain-text preview instead of body
     python read_emails.py --unread                 # Unread only
+    python read_emails.py --fetch-bodies           # Listing + full bodies (one $batch call)
+    python read_emails.py --fields id,subject      # Only these fields (smaller response)
+    python read_emails.py --since-token inbox.delta  # Only changes since the last run (delta query)
 """
 
 import argparse
+import functools
+import importlib.util
 import io
 import json
+import os
+import re
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from _graph_batch import run_batch
+
 # Fix Windows console encoding (cp1253 can't handle all Unicode)
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 
@@ -26,17 +37,68 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="repla
 SKILL_DIR = Path(__file__).resolve().parent.parent
 PROACTIVE_DIR = SKILL_DIR.parent.parent.parent / "proactive"
 sys.path.insert(0, str(PROACTIVE_DIR))
+TOKEN_CACHE_PATH = PROACTIVE_DIR / ".msal_cache.bin"
+
+# msal and the HTTP client are imported where first used (msal alone pulls in
+# cryptography); only check here that they are installed. httpx is used when it
+# and h2 are available (HTTP/2 to Graph), requests otherwise.
+_USE_HTTPX = all(importlib.util.find_spec(name) for name in ("httpx", "h2"))
+_missing = [name for name in ("msal", "requests")
+            if importlib.util.find_spec(name) is None and not (name == "requests" and _USE_HTTPX)]
+if _missing:
+    print(json.dumps({"error": f"Missing package: {', '.join(_missing)}. Run: pip install msal requests"}))
+    sys.exit(1)
+
+
+# Keyword the HTTP client takes raw bytes under
+_RAW_BODY = "content" if _USE_HTTPX else "data"
 
 try:
-    import msal
-    import requests
-except ImportError as e:
-    print(json.dumps({"error": f"Missing package: {e}. Run: pip install msal requests"}))
-    sys.exit(1)
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _json_body(obj) -> dict:
+        """Request kwargs for a JSON body, pre-encoded so the client skips json.dumps."""
+        return {_RAW_BODY: orjson.dumps(obj)}
+except ImportError:  # orjson is optional — fall back to stdlib json
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def _json_body(obj) -> dict:
+        return {"json": obj}
 
 
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
 
+# One keep-alive client for every Graph call, created on first use
+_SESSION = None
+# Retried on idempotent requests: throttling (429) and transient 5xx
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# First --since-token run: the baseline only covers mail received this recently
+DELTA_BASELINE_DAYS = 7
+
+MESSAGE_SELECT = "id,subject,from,toRecipients,ccRecipients,receivedDateTime,body,isRead,hasAttachments,importance"
+# Same fields with Graph's precomputed plain-text preview in place of the body
+PREVIEW_SELECT = MESSAGE_SELECT.replace(",body,", ",bodyPreview,")
+# Ask Graph for plain-text bodies so HTML never has to be stripped client-side
+PREFER_TEXT_BODY = {"Prefer": 'outlook.body-content-type="text"'}
+
+# Selectable listing fields (Graph name -> output key), in output order
+LIST_FIELDS = {
+    "id": "id",
+    "subject": "subject",
+    "from": "from",
+    "toRecipients": "to",
+    "receivedDateTime": "date",
+    "bodyPreview": "preview",
+    "isRead": "is_read",
+    "hasAttachments": "has_attachments",
+    "importance": "importance",
+}
+
 FOLDER_MAP = {
     "inbox": "inbox",
     "sent": "sentitems",
@@ -47,8 +109,9 @@ FOLDER_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=1)
 def load_credentials() -> dict:
-    """Load Outlook credentials from config.yaml."""
+    """Load Outlook credentials from config.yaml (parsed once per process)."""
     try:
         from core.config import load_config
         cfg = load_config()
@@ -60,7 +123,9 @@ def load_credentials() -> dict:
             print(json.dumps({"error": f"Config not found: {config_path}"}))
             sys.exit(1)
         with open(config_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+            # libyaml's C parser when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            cfg = yaml.load(f, Loader=loader) or {}
 
     client_id = cfg.get("outlook_client_id", "")
     client_secret = cfg.get("outlook_client_secret", "")
@@ -84,16 +149,50 @@ def load_credentials() -> dict:
     }
 
 
-def get_access_token(creds: dict) -> str:
-    """Get access token using MSAL client credentials flow."""
-    authority = f"https://login.microsoftonline.com/{creds['tenant_id']}"
-    app = msal.ConfidentialClientApplication(
-        creds["client_id"],
-        authority=authority,
-        client_credential=creds["client_secret"],
+def _load_token_cache() -> "msal.SerializableTokenCache":
+    """MSAL token cache persisted next to config.yaml, so tokens outlive the process."""
+    import msal
+
+    cache = msal.SerializableTokenCache()
+    if TOKEN_CACHE_PATH.exists():
+        try:
+            cache.deserialize(TOKEN_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass  # unreadable cache — start fresh
+    return cache
+
+
+def _save_token_cache(cache: "msal.SerializableTokenCache"):
+    if not cache.has_state_changed:
+        return
+    try:
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(cache.serialize())
+    except OSError:
+        pass  # caching is best-effort
+
+
+@functools.lru_cache(maxsize=1)
+def _mk_app(client_id: str, tenant_id: str, client_secret: str) -> "msal.ConfidentialClientApplication":
+    """MSAL app built once per process (authority discovery happens on construction)."""
+    import msal
+
+    return msal.ConfidentialClientApplication(
+        client_id,
+        authority=f"https://login.microsoftonline.com/{tenant_id}",
+        client_credential=client_secret,
+        token_cache=_load_token_cache(),
     )
 
-    result = app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
+
+def get_access_token(creds: dict) -> str:
+    """Get access token using MSAL client credentials flow (cached on disk until expiry)."""
+    app = _mk_app(creds["client_id"], creds["tenant_id"], creds["client_secret"])
+
+    scopes = ["https://graph.microsoft.com/.default"]
+    result = app.acquire_token_silent(scopes, account=None) or app.acquire_token_for_client(scopes=scopes)
+    _save_token_cache(app.token_cache)
 
     if "access_token" not in result:
         error_desc = result.get("error_description", result.get("error", "Unknown error"))
@@ -103,16 +202,78 @@ def get_access_token(creds: dict) -> str:
     return result["access_token"]
 
 
+def _new_client():
+    """A pooled keep-alive HTTP client: httpx over HTTP/2 when available,
+    else a requests Session. Both expose get/post/put and the same responses."""
+    if _USE_HTTPX:
+        import time
+        import httpx
+
+        class RetryTransport(httpx.HTTPTransport):
+            def handle_request(self, request):
+                for attempt in range(3):
+                    resp = super().handle_request(request)
+                    if resp.status_code not in RETRY_STATUS or request.method == "POST":
+                        return resp
+                    resp.close()
+                    time.sleep(0.3 * 2 ** attempt)
+                return super().handle_request(request)
+
+        return httpx.Client(timeout=30.0, transport=RetryTransport(
+            http2=True,
+            retries=3,  # connection failures
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        ))
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=list(RETRY_STATUS),
+                          raise_on_status=False),
+    ))
+    return session
+
+
+def _auth_session(token: str):
+    """Attach the bearer token to the shared client."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _new_client()
+    _SESSION.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    })
+    return _SESSION
+
+
+def graph_batch(token: str, reqs: list) -> list:
+    """Run Graph requests through $batch (see _graph_batch.run_batch), BATCH_LIMIT per round trip.
+    Throttled sub-requests are retried there, so callers only see final results."""
+    return run_batch(_auth_session(token), reqs, _json_body)
+
+
+def _fmt_addr(ea: dict) -> str:
+    """'Name <address>' for a Graph emailAddress, or "" if there is none."""
+    return "" if not ea else f"{ea.get('name', '')} <{ea.get('address', '')}>"
+
+
 def list_emails(token: str, user_email: str, folder: str = "inbox",
-                count: int = 10, search: str = None, unread_only: bool = False) -> list:
-    """List emails from a folder."""
+                count: int = 10, search: str = None, unread_only: bool = False,
+                fields: list = None) -> list:
+    """List emails from a folder. `fields` narrows the LIST_FIELDS returned (id is always kept)."""
     folder_id = FOLDER_MAP.get(folder.lower(), folder)
     url = f"{GRAPH_BASE}/users/{user_email}/mailFolders/{folder_id}/messages"
 
+    selected = list(LIST_FIELDS) if not fields else ["id"] + [f for f in fields if f != "id"]
     params = {
         "$top": count,
         "$orderby": "receivedDateTime desc",
-        "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview,isRead,hasAttachments,importance",
+        "$select": ",".join(selected),
     }
 
     if search:
@@ -121,91 +282,187 @@ def list_emails(token: str, user_email: str, folder: str = "inbox",
     if unread_only:
         params["$filter"] = "isRead eq false"
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
+    resp = _auth_session(token).get(url, params=params, timeout=30)
 
     if resp.status_code != 200:
         return [{"error": f"API error {resp.status_code}: {resp.text[:500]}"}]
 
     data = resp.json()
-    messages = data.get("value", [])
-
-    results = []
-    for msg in messages:
-        from_addr = ""
-        if msg.get("from", {}).get("emailAddress"):
-            ea = msg["from"]["emailAddress"]
-            from_addr = f"{ea.get('name', '')} <{ea.get('address', '')}>"
-
-        to_addrs = []
-        for r in msg.get("toRecipients", []):
-            ea = r.get("emailAddress", {})
-            to_addrs.append(f"{ea.get('name', '')} <{ea.get('address', '')}>")
-
-        results.append({
+    return _summarize(data.get("value", []), selected if fields else None)
+
+
+def list_email_changes(token: str, user_email: str, state_file: str, folder: str = "inbox",
+                       count: int = 10, fields: list = None) -> dict:
+    """Changes to a folder since the previous call, via a Graph delta query.
+
+    The deltaLink is kept in `state_file`. The first call (no state yet) syncs
+    only the last DELTA_BASELINE_DAYS of mail as the baseline. At most `count`
+    changed messages are returned, newest first; "total_changed" reports how
+    many there were when that cap applies.
+    """
+    state = Path(state_file)
+    selected = list(LIST_FIELDS) if not fields else ["id"] + [f for f in fields if f != "id"]
+    url = state.read_text(encoding="utf-8").strip() if state.exists() else ""
+    params = None
+    if not url:
+        folder_id = FOLDER_MAP.get(folder.lower(), folder)
+        url = f"{GRAPH_BASE}/users/{user_email}/mailFolders/{folder_id}/messages/delta"
+        since = datetime.now(timezone.utc) - timedelta(days=DELTA_BASELINE_DAYS)
+        params = {
+            # receivedDateTime is always fetched so the newest `count` can be picked
+            "$select": ",".join(dict.fromkeys(selected + ["receivedDateTime"])),
+            "$filter": f"receivedDateTime ge {since.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+        }
+
+    session = _auth_session(token)
+    headers = {"Prefer": f"odata.maxpagesize={count}"}
+    changed, removed = [], []
+    while True:
+        resp = session.get(url, params=params, headers=headers, timeout=30)
+        if resp.status_code == 410:
+            state.unlink(missing_ok=True)  # delta token expired — next call re-syncs
+        if resp.status_code != 200:
+            return {"error": f"API error {resp.status_code}: {resp.text[:500]}"}
+        data = resp.json()
+        for msg in data.get("value", []):
+            if "@removed" in msg:
+                removed.append(msg.get("id", ""))
+            else:
+                changed.append(msg)
+        url, params = data.get("@odata.nextLink"), None
+        if not url:
+            break
+
+    delta_link = data.get("@odata.deltaLink")
+    if delta_link:
+        tmp = state.with_name(state.name + ".tmp")
+        tmp.write_text(delta_link, encoding="utf-8")
+        os.replace(tmp, state)
+
+    result = {"removed": removed}
+    if len(changed) > count:
+        changed.sort(key=lambda m: m.get("receivedDateTime", ""), reverse=True)
+        result["total_changed"] = len(changed)
+        changed = changed[:count]
+    result["changed"] = _summarize(changed, selected if fields else None)
+    return result
+
+
+def _summarize(messages: list, selected: list = None) -> list:
+    """Listing entries for Graph messages, limited to the `selected` LIST_FIELDS if given."""
+    results = [
+        {
             "id": msg.get("id", ""),
             "subject": msg.get("subject", "(no subject)"),
-            "from": from_addr,
-            "to": ", ".join(to_addrs),
+            "from": _fmt_addr(msg.get("from", {}).get("emailAddress")),
+            "to": ", ".join(_fmt_addr(r.get("emailAddress")) for r in msg.get("toRecipients", [])),
             "date": msg.get("receivedDateTime", ""),
             "preview": msg.get("bodyPreview", "")[:200],
             "is_read": msg.get("isRead", False),
             "has_attachments": msg.get("hasAttachments", False),
             "importance": msg.get("importance", "normal"),
-        })
+        }
+        for msg in messages
+    ]
 
+    if selected:
+        keep = {LIST_FIELDS[f] for f in selected}
+        results = [{k: v for k, v in r.items() if k in keep} for r in results]
     return results
 
 
-def read_email_by_id(token: str, user_email: str, message_id: str) -> dict:
-    """Read a specific email by ID."""
+def read_email_by_id(token: str, user_email: str, message_id: str, preview: bool = False) -> dict:
+    """Read a specific email by ID. With `preview`, only Graph's plain-text
+    bodyPreview is fetched instead of the full body."""
     url = f"{GRAPH_BASE}/users/{user_email}/messages/{message_id}"
 
     params = {
-        "$select": "id,subject,from,toRecipients,ccRecipients,receivedDateTime,body,isRead,hasAttachments,importance",
+        "$select": PREVIEW_SELECT if preview else MESSAGE_SELECT,
     }
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
+    resp = _auth_session(token).get(url, params=params, headers=None if preview else PREFER_TEXT_BODY,
+                                    timeout=30)
 
     if resp.status_code != 200:
         return {"error": f"API error {resp.status_code}: {resp.text[:500]}"}
 
-    msg = resp.json()
+    return format_message(resp.json())
 
-    from_addr = ""
-    if msg.get("from", {}).get("emailAddress"):
-        ea = msg["from"]["emailAddress"]
-        from_addr = f"{ea.get('name', '')} <{ea.get('address', '')}>"
 
-    to_addrs = []
-    for r in msg.get("toRecipients", []):
-        ea = r.get("emailAddress", {})
-        to_addrs.append(f"{ea.get('name', '')} <{ea.get('address', '')}>")
+def read_emails_by_ids(token: str, user_email: str, message_ids: list) -> list:
+    """Read several emails by ID, batching the lookups instead of one GET each."""
+    responses = graph_batch(token, [
+        {"method": "GET", "url": f"/users/{user_email}/messages/{mid}?$select={MESSAGE_SELECT}",
+         "headers": PREFER_TEXT_BODY}
+        for mid in message_ids
+    ])
+    results = []
+    for r in responses:
+        if r["status"] != 200:
+            results.append({"error": f"API error {r['status']}: {json.dumps(r['body'])[:500]}"})
+        else:
+            results.append(format_message(r["body"]))
+    return results
+
+
+# Elements whose content is dropped along with the tags, and the marker that ends them
+_SKIP_UNTIL = {
+    "style": re.compile(r"</style", re.I),
+    "script": re.compile(r"</script", re.I),
+    "!--": re.compile(r"-->"),
+}
 
-    cc_addrs = []
-    for r in msg.get("ccRecipients", []):
-        ea = r.get("emailAddress", {})
-        cc_addrs.append(f"{ea.get('name', '')} <{ea.get('address', '')}>")
 
-    body = msg.get("body", {})
-    body_content = body.get("content", "")
-    body_type = body.get("contentType", "text")
+def strip_html(s: str, limit: int = 5000) -> str:
+    """Plain text from an HTML body in one forward scan, stopping after `limit` chars.
+
+    Tags become word breaks, <style>/<script> blocks and comments are dropped,
+    and runs of whitespace collapse to a single space.
+    """
+    words = []
+    size = 0
+    i, n = 0, len(s)
+    while i < n and size <= limit:
+        lt = s.find("<", i)
+        text = s[i:] if lt < 0 else s[i:lt]
+        for word in text.split():
+            words.append(word)
+            size += len(word) + 1
+        if lt < 0:
+            break
+
+        gt = s.find(">", lt + 1)
+        if gt < 0:
+            words.extend(s[lt:].split())  # a '<' that never closes is plain text
+            break
+
+        i = gt + 1
+        # Case-insensitive matching on `s` itself: a lowered copy can differ in
+        # length (e.g. 'İ'), which would shift every offset after it
+        for name, end in _SKIP_UNTIL.items():
+            if s[lt + 1:lt + 1 + len(name)].lower() == name:
+                close = end.search(s, lt + 1 + len(name))
+                i = n if close is None else s.find(">", close.start()) + 1 or n
+                break
+    return " ".join(words)[:limit]
+
+
+def format_message(msg: dict) -> dict:
+    """Shape a full Graph message (with body) for output."""
+    from_addr = _fmt_addr(msg.get("from", {}).get("emailAddress"))
+    to_addrs = [_fmt_addr(r.get("emailAddress")) for r in msg.get("toRecipients", [])]
+    cc_addrs = [_fmt_addr(r.get("emailAddress")) for r in msg.get("ccRecipients", [])]
+
+    if "body" not in msg:
+        body_content = msg.get("bodyPreview", "")  # already plain text
+    else:
+        body = msg.get("body") or {}
+        body_content = body.get("content", "")
+        body_type = body.get("contentType", "text")
 
-    # Strip HTML tags for readability if HTML
-    if body_type.lower() == "html":
-        import re
-        body_content = re.sub(r'<style[^>]*>.*?</style>', '', body_content, flags=re.DOTALL)
-        body_content = re.sub(r'<[^>]+>', ' ', body_content)
-        body_content = re.sub(r'\s+', ' ', body_content).strip()
+        # Strip HTML tags for readability if HTML
+        if body_type.lower() == "html":
+            body_content = strip_html(body_content)
 
     return {
         "id": msg.get("id", ""),
@@ -227,28 +484,72 @@ def main():
     parser.add_argument("--count", type=int, default=10, help="Number of emails to fetch (default: 10)")
     parser.add_argument("--search", default=None, help="Search query string")
     parser.add_argument("--id", default=None, help="Read a specific email by message ID")
+    parser.add_argument("--preview", action="store_true",
+                        help="With --id: return the plain-text body preview only (no HTML, much smaller)")
     parser.add_argument("--unread", action="store_true", help="Show unread emails only")
+    parser.add_argument("--fetch-bodies", action="store_true",
+                        help="Also fetch the full body of every listed email (batched)")
+    parser.add_argument("--fields", default=None,
+                        help=f"Comma-separated listing fields to fetch (default: all). One of: {', '.join(LIST_FIELDS)}")
+    parser.add_argument("--since-token", default=None, metavar="FILE",
+                        help="Return only changes since the run that wrote FILE (created on first use)")
     args = parser.parse_args()
+    if args.since_token and (args.search or args.unread):
+        parser.error("--since-token cannot be combined with --search or --unread")
+
+    fields = None
+    if args.fields:
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in LIST_FIELDS]
+        if unknown:
+            print(json.dumps({"error": f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(LIST_FIELDS)}"}))
+            sys.exit(1)
 
     creds = load_credentials()
     token = get_access_token(creds)
 
     if args.id:
-        result = read_email_by_id(token, creds["user_email"], args.id)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        result = read_email_by_id(token, creds["user_email"], args.id, preview=args.preview)
+        print(_dumps(result))
     else:
-        results = list_emails(
-            token, creds["user_email"],
-            folder=args.folder,
-            count=args.count,
-            search=args.search,
-            unread_only=args.unread,
-        )
-        print(json.dumps({
+        removed = total_changed = None
+        if args.since_token:
+            changes = list_email_changes(
+                token, creds["user_email"], args.since_token,
+                folder=args.folder,
+                count=args.count,
+                fields=fields,
+            )
+            if "error" in changes:
+                print(_dumps(changes))
+                sys.exit(1)
+            results, removed = changes["changed"], changes["removed"]
+            total_changed = changes.get("total_changed")
+        else:
+            results = list_emails(
+                token, creds["user_email"],
+                folder=args.folder,
+                count=args.count,
+                search=args.search,
+                unread_only=args.unread,
+                fields=fields,
+            )
+        if args.fetch_bodies:
+            ids = [r["id"] for r in results if r.get("id")]
+            full = {m.get("id"): m for m in read_emails_by_ids(token, creds["user_email"], ids)}
+            for r in results:
+                if r.get("id") in full:
+                    r["body"] = full[r["id"]].get("body", "")
+        output = {
             "folder": args.folder,
             "count": len(results),
             "emails": results,
-        }, indent=2, ensure_ascii=False))
+        }
+        if removed is not None:
+            output["removed"] = removed
+        if total_changed is not None:
+            output["total_changed"] = total_changed
+        print(_dumps(output))
 
 
 if __name__ == "__main__":
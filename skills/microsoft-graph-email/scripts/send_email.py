@@ -9,15 +9,24 @@ Usage:
     python send_email.py --to "email@example.com" --subject "Subject" --body "Body text"
     python send_email.py --to "email@example.com" --subject "Subject" --html-file "report.html"
     python send_email.py --to "a@x.com,b@y.com" --subject "Subject" --body "Body" --cc "c@z.com"
+    python send_email.py --to-file recipients.txt --subject "Subject" --body "Body"   # one email per line, batched
 """
 
 import argparse
 import base64
+import functools
+import importlib.util
 import io
 import json
+import os
+import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _graph_batch import BATCH_LIMIT, run_batch
+
 # Fix Windows console encoding (cp1253 can't handle all Unicode)
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 
@@ -25,20 +34,62 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="repla
 SKILL_DIR = Path(__file__).resolve().parent.parent
 PROACTIVE_DIR = SKILL_DIR.parent.parent.parent / "proactive"
 sys.path.insert(0, str(PROACTIVE_DIR))
+TOKEN_CACHE_PATH = PROACTIVE_DIR / ".msal_cache.bin"
+
+# msal and the HTTP client are imported where first used (msal alone pulls in
+# cryptography); only check here that they are installed. httpx is used when it
+# and h2 are available (HTTP/2 to Graph), requests otherwise.
+_USE_HTTPX = all(importlib.util.find_spec(name) for name in ("httpx", "h2"))
+_missing = [name for name in ("msal", "requests")
+            if importlib.util.find_spec(name) is None and not (name == "requests" and _USE_HTTPX)]
+if _missing:
+    print(json.dumps({"error": f"Missing package: {', '.join(_missing)}. Run: pip install msal requests"}))
+    sys.exit(1)
+
+
+# Keyword the HTTP client takes raw bytes under
+_RAW_BODY = "content" if _USE_HTTPX else "data"
 
 try:
-    import msal
-    import requests
-except ImportError as e:
-    print(json.dumps({"error": f"Missing package: {e}. Run: pip install msal requests"}))
-    sys.exit(1)
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _json_body(obj) -> dict:
+        """Request kwargs for a JSON body, pre-encoded so the client skips json.dumps."""
+        return {_RAW_BODY: orjson.dumps(obj)}
+except ImportError:  # orjson is optional — fall back to stdlib json
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def _json_body(obj) -> dict:
+        return {"json": obj}
 
 
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
 
+# One keep-alive client for every Graph call, created on first use
+_SESSION = None
+# Retried on idempotent requests: throttling (429) and transient 5xx
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Largest $batch body we send (Graph rejects oversized requests); bigger
+# messages are sent one sendMail call each
+BATCH_PAYLOAD_LIMIT = 4 * 1024 * 1024
 
+# Attachments at or above this size go through an upload session instead of
+# being inlined as base64 (sendMail rejects request bodies over 4 MB)
+INLINE_ATTACHMENT_LIMIT = 3 * 1024 * 1024
+# Upload session chunk size; Graph requires a multiple of 320 KiB
+UPLOAD_CHUNK_SIZE = 10 * 327_680
+# Raw bytes base64-encoded per read (a multiple of 3, so chunks concatenate cleanly)
+ENCODE_CHUNK_SIZE = 57_000
+
+
+@functools.lru_cache(maxsize=1)
 def load_credentials() -> dict:
-    """Load Outlook credentials from config.yaml."""
+    """Load Outlook credentials from config.yaml (parsed once per process)."""
     try:
         from core.config import load_config
         cfg = load_config()
@@ -50,7 +101,9 @@ def load_credentials() -> dict:
             print(json.dumps({"error": f"Config not found: {config_path}"}))
             sys.exit(1)
         with open(config_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+            # libyaml's C parser when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            cfg = yaml.load(f, Loader=loader) or {}
 
     client_id = cfg.get("outlook_client_id", "")
     client_secret = cfg.get("outlook_client_secret", "")
@@ -74,16 +127,50 @@ def load_credentials() -> dict:
     }
 
 
-def get_access_token(creds: dict) -> str:
-    """Get access token using MSAL client credentials flow."""
-    authority = f"https://login.microsoftonline.com/{creds['tenant_id']}"
-    app = msal.ConfidentialClientApplication(
-        creds["client_id"],
-        authority=authority,
-        client_credential=creds["client_secret"],
+def _load_token_cache() -> "msal.SerializableTokenCache":
+    """MSAL token cache persisted next to config.yaml, so tokens outlive the process."""
+    import msal
+
+    cache = msal.SerializableTokenCache()
+    if TOKEN_CACHE_PATH.exists():
+        try:
+            cache.deserialize(TOKEN_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass  # unreadable cache — start fresh
+    return cache
+
+
+def _save_token_cache(cache: "msal.SerializableTokenCache"):
+    if not cache.has_state_changed:
+        return
+    try:
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(cache.serialize())
+    except OSError:
+        pass  # caching is best-effort
+
+
+@functools.lru_cache(maxsize=1)
+def _mk_app(client_id: str, tenant_id: str, client_secret: str) -> "msal.ConfidentialClientApplication":
+    """MSAL app built once per process (authority discovery happens on construction)."""
+    import msal
+
+    return msal.ConfidentialClientApplication(
+        client_id,
+        authority=f"https://login.microsoftonline.com/{tenant_id}",
+        client_credential=client_secret,
+        token_cache=_load_token_cache(),
     )
 
-    result = app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
+
+def get_access_token(creds: dict) -> str:
+    """Get access token using MSAL client credentials flow (cached on disk until expiry)."""
+    app = _mk_app(creds["client_id"], creds["tenant_id"], creds["client_secret"])
+
+    scopes = ["https://graph.microsoft.com/.default"]
+    result = app.acquire_token_silent(scopes, account=None) or app.acquire_token_for_client(scopes=scopes)
+    _save_token_cache(app.token_cache)
 
     if "access_token" not in result:
         error_desc = result.get("error_description", result.get("error", "Unknown error"))
@@ -93,16 +180,83 @@ def get_access_token(creds: dict) -> str:
     return result["access_token"]
 
 
-def send_email(token: str, user_email: str, to_addresses: list, subject: str,
-               body: str, content_type: str = "HTML", cc_addresses: list = None,
-               bcc_addresses: list = None, importance: str = "normal", attachments: list = None) -> dict:
-    """Send an email via Microsoft Graph API."""
-    url = f"{GRAPH_BASE}/users/{user_email}/sendMail"
+def _new_client():
+    """A pooled keep-alive HTTP client: httpx over HTTP/2 when available,
+    else a requests Session. Both expose get/post/put and the same responses."""
+    if _USE_HTTPX:
+        import time
+        import httpx
+
+        class RetryTransport(httpx.HTTPTransport):
+            def handle_request(self, request):
+                for attempt in range(3):
+                    resp = super().handle_request(request)
+                    if resp.status_code not in RETRY_STATUS or request.method == "POST":
+                        return resp
+                    resp.close()
+                    time.sleep(0.3 * 2 ** attempt)
+                return super().handle_request(request)
+
+        return httpx.Client(timeout=30.0, transport=RetryTransport(
+            http2=True,
+            retries=3,  # connection failures
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        ))
 
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=list(RETRY_STATUS),
+                          raise_on_status=False),
+    ))
+    return session
+
+
+def _auth_session(token: str):
+    """Attach the bearer token to the shared client."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _new_client()
+    _SESSION.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    })
+    return _SESSION
+
+
+def graph_batch(token: str, reqs: list, batch_size: int = BATCH_LIMIT) -> list:
+    """Run Graph requests through $batch (see _graph_batch.run_batch), batch_size per round trip."""
+    return run_batch(_auth_session(token), reqs, _json_body, batch_size)
+
+
+# Address separators: commas, semicolons (Outlook copy-paste) and whitespace
+_ADDR_SEP = re.compile(r"[,;\s]+")
+
+
+def _recipients(addresses) -> list:
+    """Graph recipient dicts from a list of addresses or a string split on _ADDR_SEP."""
+    if not addresses:
+        return []
+    if isinstance(addresses, str):
+        addresses = _ADDR_SEP.split(addresses)
+    else:
+        addresses = (a.strip() for a in addresses)
+    return [{"emailAddress": {"address": a}} for a in addresses if a]
+
+
+def build_message(to_addresses, subject: str, body: str, content_type: str = "HTML",
+                  cc_addresses=None, bcc_addresses=None,
+                  importance: str = "normal", attachments: list = None) -> dict:
+    """Build the sendMail request body. Addresses may be lists or separated strings."""
     # Build recipient lists
-    to_recipients = [{"emailAddress": {"address": addr.strip()}} for addr in to_addresses]
-    cc_recipients = [{"emailAddress": {"address": addr.strip()}} for addr in (cc_addresses or [])] if cc_addresses else []
-    bcc_recipients = [{"emailAddress": {"address": addr.strip()}} for addr in (bcc_addresses or [])] if bcc_addresses else []
+    to_recipients = _recipients(to_addresses)
+    cc_recipients = _recipients(cc_addresses)
+    bcc_recipients = _recipients(bcc_addresses)
 
     message = {
         "message": {
@@ -122,41 +276,111 @@ def send_email(token: str, user_email: str, to_addresses: list, subject: str,
     if bcc_recipients:
         message["message"]["bccRecipients"] = bcc_recipients
 
-    # Add attachments if provided
+    # Add attachments if provided (inlined; see split_attachments for large files).
+    # File reads and base64 release the GIL, so several files encode in parallel.
     if attachments:
-        attachment_list = []
-        for file_path in attachments:
-            path = Path(file_path)
-            if not path.exists():
-                print(json.dumps({"error": f"Attachment not found: {file_path}"}))
-                sys.exit(1)
+        paths = [Path(p) for p in attachments]
+        if len(paths) == 1:
+            encoded = [encode_attachment(paths[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                encoded = list(pool.map(encode_attachment, paths))
+        message["message"]["attachments"] = encoded
+
+    return message
+
+
+def split_attachments(attachments: list) -> tuple[list, list]:
+    """Check attachments exist and split them into (inline, upload-session) paths by size."""
+    inline, large = [], []
+    for file_path in attachments or []:
+        path = Path(file_path)
+        if not path.exists():
+            print(json.dumps({"error": f"Attachment not found: {file_path}"}))
+            sys.exit(1)
+        (large if path.stat().st_size >= INLINE_ATTACHMENT_LIMIT else inline).append(path)
+    return inline, large
 
-            with open(path, "rb") as f:
-                content = base64.b64encode(f.read()).decode("utf-8")
 
-            attachment_list.append({
-                "@odata.type": "#microsoft.graph.fileAttachment",
-                "name": path.name,
-                "contentBytes": content,
-            })
+def encode_attachment(path: Path) -> dict:
+    """fileAttachment for an inline file, base64-encoded a chunk at a time."""
+    content = bytearray()
+    with open(path, "rb") as f:
+        while chunk := f.read(ENCODE_CHUNK_SIZE):
+            content += base64.b64encode(chunk)
+    return {
+        "@odata.type": "#microsoft.graph.fileAttachment",
+        "name": path.name,
+        "contentBytes": content.decode("ascii"),
+    }
 
-        message["message"]["attachments"] = attachment_list
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
+def send_with_uploads(token: str, user_email: str, message: dict, large: list):
+    """Send via draft + upload sessions so large attachments stream in chunks.
+
+    Returns the response of the first failing step, or of the final /send call.
+    """
+    session = _auth_session(token)
+    base = f"{GRAPH_BASE}/users/{user_email}/messages"
+
+    resp = session.post(base, **_json_body(message["message"]), timeout=30)
+    if resp.status_code != 201:
+        return resp
+    message_id = resp.json()["id"]
+
+    # The upload URLs are pre-authorized and Graph rejects a bearer token on
+    # them, so chunks go through a separate client without one
+    uploader = _new_client()
+    for path in large:
+        size = path.stat().st_size
+        resp = session.post(
+            f"{base}/{message_id}/attachments/createUploadSession",
+            **_json_body({"AttachmentItem": {"attachmentType": "file", "name": path.name, "size": size}}),
+            timeout=30,
+        )
+        if resp.status_code != 201:
+            return resp
+        upload_url = resp.json()["uploadUrl"]
+
+        with open(path, "rb") as f:
+            offset = 0
+            while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                end = offset + len(chunk) - 1
+                resp = uploader.put(upload_url, **{_RAW_BODY: chunk}, timeout=120, headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Range": f"bytes {offset}-{end}/{size}",
+                })
+                if resp.status_code not in (200, 201):
+                    return resp
+                offset = end + 1
+
+    return session.post(f"{base}/{message_id}/send", timeout=30)
+
+
+def send_email(token: str, user_email: str, to_addresses, subject: str,
+               body: str, content_type: str = "HTML", cc_addresses=None,
+               bcc_addresses=None, importance: str = "normal", attachments: list = None) -> dict:
+    """Send an email via Microsoft Graph API. Addresses may be lists or separated strings."""
+    url = f"{GRAPH_BASE}/users/{user_email}/sendMail"
+    inline, large = split_attachments(attachments)
+    message = build_message(to_addresses, subject, body, content_type,
+                            cc_addresses, bcc_addresses, importance, inline)
 
-    resp = requests.post(url, headers=headers, json=message, timeout=30)
+    if large:
+        resp = send_with_uploads(token, user_email, message, large)
+    else:
+        resp = _auth_session(token).post(url, **_json_body(message), timeout=30)
 
     if resp.status_code == 202:
+        to = [r["emailAddress"]["address"] for r in message["message"]["toRecipients"]]
+        cc = [r["emailAddress"]["address"] for r in message["message"].get("ccRecipients", [])]
         return {
             "success": True,
-            "message": f"Email sent successfully to {', '.join(to_addresses)}",
+            "message": f"Email sent successfully to {', '.join(to)}",
             "subject": subject,
             "from": user_email,
-            "to": to_addresses,
-            "cc": cc_addresses or [],
+            "to": to,
+            "cc": cc,
         }
     else:
         return {
@@ -165,15 +389,70 @@ def send_email(token: str, user_email: str, to_addresses: list, subject: str,
         }
 
 
+def send_bulk(token: str, user_email: str, recipients: list, subject: str,
+              body: str, content_type: str = "HTML", cc_addresses=None, bcc_addresses=None,
+              importance: str = "normal", attachments: list = None) -> dict:
+    """Send one email per recipient, batching sendMail calls when the messages are small.
+
+    Up to BATCH_LIMIT messages share a $batch round trip as long as the batch
+    stays under BATCH_PAYLOAD_LIMIT; otherwise each email is sent on its own.
+    """
+    sent, failed = [], []
+    inline, large = split_attachments(attachments)
+    template = None
+    per_batch = 1
+    if not large:
+        # Upload sessions can't go through $batch; only inline messages are batched
+        template = build_message([], subject, body, content_type, cc_addresses, bcc_addresses,
+                                 importance=importance, attachments=inline)
+        message_size = len(json.dumps(template)) + 512  # + recipient and batch envelope
+        per_batch = min(BATCH_LIMIT, BATCH_PAYLOAD_LIMIT // message_size)
+
+    if per_batch < 2:
+        for addr in recipients:
+            r = send_email(token, user_email, [addr], subject, body, content_type,
+                           cc_addresses, bcc_addresses, importance=importance, attachments=attachments)
+            if r["success"]:
+                sent.append(addr)
+            else:
+                failed.append({"to": addr, "error": r["error"]})
+    else:
+        reqs = []
+        for addr in recipients:
+            message = {**template, "message": {
+                **template["message"],
+                "toRecipients": [{"emailAddress": {"address": addr}}],
+            }}
+            reqs.append({"method": "POST", "url": f"/users/{user_email}/sendMail", "body": message})
+
+        for addr, r in zip(recipients, graph_batch(token, reqs, per_batch)):
+            if r["status"] == 202:
+                sent.append(addr)
+            else:
+                failed.append({"to": addr, "error": f"API error {r['status']}: {json.dumps(r['body'])[:500]}"})
+
+    return {
+        "success": not failed,
+        "message": f"Sent {len(sent)} of {len(recipients)} emails",
+        "subject": subject,
+        "from": user_email,
+        "sent": sent,
+        "failed": failed,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Send emails via Microsoft Graph API")
-    parser.add_argument("--to", required=True, help="Recipient email(s), comma-separated")
+    recipients = parser.add_mutually_exclusive_group(required=True)
+    recipients.add_argument("--to", help="Recipient email(s), separated by commas, semicolons or spaces")
+    recipients.add_argument("--to-file", default=None,
+                            help="File with one recipient per line; each gets their own email (batched)")
     parser.add_argument("--subject", required=True, help="Email subject")
     parser.add_argument("--body", default=None, help="Email body (plain text or HTML)")
     parser.add_argument("--html-file", default=None, help="Read HTML body from file")
     parser.add_argument("--text-file", default=None, help="Read plain text body from file")
-    parser.add_argument("--cc", default=None, help="CC recipient(s), comma-separated")
-    parser.add_argument("--bcc", default=None, help="BCC recipient(s), comma-separated")
+    parser.add_argument("--cc", default=None, help="CC recipient(s), separated like --to")
+    parser.add_argument("--bcc", default=None, help="BCC recipient(s), separated like --to")
     parser.add_argument("--importance", default="normal", choices=["low", "normal", "high"], help="Email importance")
     parser.add_argument("--attachment", dest="attachments", action="append", help="Attachment file path (can be used multiple times)")
     args = parser.parse_args()
@@ -207,27 +486,46 @@ def main():
         print(json.dumps({"error": "Must provide --body, --html-file, or --text-file"}))
         sys.exit(1)
 
-    # Parse addresses
-    to_addresses = [addr.strip() for addr in args.to.split(",")]
-    cc_addresses = [addr.strip() for addr in args.cc.split(",")] if args.cc else None
-    bcc_addresses = [addr.strip() for addr in args.bcc.split(",")] if args.bcc else None
+    if args.to_file:
+        to_path = Path(args.to_file)
+        if not to_path.exists():
+            print(json.dumps({"error": f"Recipients file not found: {to_path}"}))
+            sys.exit(1)
+        with open(to_path, "r", encoding="utf-8") as f:
+            recipients = [line.strip() for line in f if line.strip()]
+
+        creds = load_credentials()
+        token = get_access_token(creds)
+        result = send_bulk(
+            token, creds["user_email"],
+            recipients=recipients,
+            subject=args.subject,
+            body=body,
+            content_type=content_type,
+            cc_addresses=args.cc,
+            bcc_addresses=args.bcc,
+            importance=args.importance,
+            attachments=args.attachments,
+        )
+        print(_dumps(result))
+        return
 
     creds = load_credentials()
     token = get_access_token(creds)
 
     result = send_email(
         token, creds["user_email"],
-        to_addresses=to_addresses,
+        to_addresses=args.to,
         subject=args.subject,
         body=body,
         content_type=content_type,
-        cc_addresses=cc_addresses,
-        bcc_addresses=bcc_addresses,
+        cc_addresses=args.cc,
+        bcc_addresses=args.bcc,
         importance=args.importance,
         attachments=args.attachments,
     )
 
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(_dumps(result))
 
 
 if __name__ == "__main__":
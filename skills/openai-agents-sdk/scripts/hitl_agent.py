@@ -69,10 +69,12 @@ async def main():
         print("\n--- Approval Required ---")
         state = result.to_state()
 
+        # Decide every pending call before resuming: one run resolves them all
         for interruption in result.interruptions:
             print(f"Tool: {interruption.name}")
             print(f"Args: {interruption.arguments}")
-            answer = input("Approve? [y/N]: ").strip().lower()
+            # Blocking input() in a worker thread keeps the event loop responsive
+            answer = (await asyncio.to_thread(input, "Approve? [y/N]: ")).strip().lower()
 
             if answer in ("y", "yes"):
                 state.approve(interruption)
@@ -13,7 +13,7 @@ Usage:
 
 import asyncio
 from dataclasses import dataclass
-from agents import Agent, Runner, RunContextWrapper, function_tool, handoff
+from agents import Agent, ModelSettings, Runner, RunContextWrapper, function_tool, handoff
 
 
 # ── Shared Context ────────────────────────────────────
@@ -88,10 +88,15 @@ Determine the user's need and hand off to the right specialist:
 
 
 # ── Pattern 2: Manager with Sub-Agents as Tools ──────
+# The runner executes all tool calls from one model turn concurrently, so letting
+# the model emit independent sub-tasks together turns K sequential specialist
+# runs into one round bounded by the slowest.
 manager_agent = Agent[AppContext](
     name="Manager",
     instructions="""You coordinate specialist agents to solve customer problems.
-Call the relevant tool for each sub-task. Combine results into a clear response.""",
+Call the relevant tool for each sub-task. When sub-tasks are independent,
+call all of their tools in the same turn. Combine results into a clear response.""",
+    model_settings=ModelSettings(parallel_tool_calls=True),
     tools=[
         orders_agent.as_tool(
             tool_name="check_orders",
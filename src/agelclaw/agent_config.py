@@ -7,7 +7,12 @@ api_server.py and telegram_bot.py.
 Supports multi-provider routing (Claude, OpenAI) via the AgentRouter.
 """
 
+import hashlib
+import json
+import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from claude_agent_sdk import ClaudeAgentOptions
@@ -21,12 +26,104 @@ PROACTIVE_DIR = get_project_dir()
 SHARED_SESSION_ID = "shared_chat"
 DB_PATH = get_db_path()
 
+_conn_tls = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return this thread's read-only connection to the memory database, opening it once."""
+    conn = getattr(_conn_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # Per-connection read tuning (none of these persist in the database file;
+        # Memory puts the database in WAL mode)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _conn_tls.conn = conn
+    return conn
+
 # All agent channels (chat, telegram, daemon) share the same full tool set
 AGENT_TOOLS = ["Skill", "Read", "Write", "Edit", "Bash", "Glob", "Grep", "WebFetch", "WebSearch"]
 
 # Backward-compat alias
 ALLOWED_TOOLS = AGENT_TOOLS
 
+# Frontmatter is a few hundred bytes; never read more than this of a SKILL.md
+_FRONTMATTER_READ_LIMIT = 8192
+
+
+def _read_frontmatter(path: Path) -> str:
+    """Return the YAML frontmatter of a SKILL.md / SUBAGENT.md without reading the body.
+
+    Only the first _FRONTMATTER_READ_LIMIT bytes are read. Returns "" when the
+    file has no `---` block that closes within that window.
+    """
+    with path.open("rb") as f:
+        head = f.read(_FRONTMATTER_READ_LIMIT).lstrip()
+    if not head.startswith(b"---"):
+        return ""
+    nl = head.find(b"\n")
+    if nl < 0 or head[3:nl].strip():
+        return ""
+    end = head.find(b"\n---", nl)
+    if end < 0:
+        return ""
+    return _fast_decode(head[nl + 1:end])
+
+
+def _fast_decode(b: bytes) -> str:
+    """Decode bytes, taking the plain ASCII path first (most frontmatter is ASCII)."""
+    try:
+        return b.decode("ascii")
+    except UnicodeDecodeError:
+        return b.decode("utf-8", errors="replace")
+
+# Values that open a block on the following indented lines
+_BLOCK_MARKERS = ("", ">", ">-", ">+", "|", "|-", "|+")
+
+
+def _finish_block(lines: list[str]):
+    """Turn collected block lines into a list (`- item` lines) or a folded string."""
+    if lines and all(line.startswith("-") for line in lines):
+        return [line.lstrip("- ") for line in lines]
+    return " ".join(" ".join(lines).split())
+
+
+def _parse_frontmatter(fm: str) -> dict:
+    """Parse the flat YAML subset used in catalog frontmatter in a single pass.
+
+    Handles `key: value` scalars, block scalars (`>-`, `|`) and `- item` lists.
+    Returns {key: str | list[str]}; block scalars are whitespace-collapsed.
+    """
+    fields = {}
+    key = None
+    block = None  # lines collected for the current block-valued key
+    for line in fm.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if line[0].isspace() or stripped.startswith("- "):
+            if block is not None:
+                block.append(stripped)
+            continue
+        if block is not None:
+            fields[key] = _finish_block(block)
+        name, sep, value = line.partition(":")
+        if not sep:
+            key, block = None, None
+            continue
+        key, value = name.strip(), value.strip()
+        if value in _BLOCK_MARKERS:
+            block = []
+        else:
+            block = None
+            fields[key] = value.strip('"\'')
+    if block is not None:
+        fields[key] = _finish_block(block)
+    return fields
+
 # Singleton router
 _router = AgentRouter()
 
@@ -249,87 +346,146 @@ VIOLATION: Responding to "ναι" with another description instead of executing
 """
 
 
-def _scan_installed_subagents() -> str:
+import time as _time
+
+# Shared Memory instance for prompt building (schema init runs once per process)
+_MEM = None
+
+
+def _get_memory():
+    """Return the module-wide Memory instance, creating it on first use."""
+    global _MEM
+    if _MEM is None:
+        from agelclaw.memory import Memory
+        _MEM = Memory()
+    return _MEM
+
+
+# Per-file catalog entries, keyed by the SKILL.md / SUBAGENT.md path. An entry is
+# re-rendered only when the file (or its scripts/ directory) changes on disk.
+_entry_cache: dict[Path, tuple[tuple, object]] = {}
+
+
+def _file_signature(md_path: Path, scripts_dir: Path) -> tuple:
+    """(mtime_ns, size) of the definition file plus the scripts/ dir mtime."""
+    st = md_path.stat()
+    try:
+        scripts_mtime = scripts_dir.stat().st_mtime_ns
+    except OSError:
+        scripts_mtime = 0
+    return (st.st_mtime_ns, st.st_size, scripts_mtime)
+
+
+def _cached_entry(md_path: Path, scripts_dir: Path, render):
+    """Return render(md_path) from the per-file cache, re-rendering on change."""
+    sig = _file_signature(md_path, scripts_dir)
+    cached = _entry_cache.get(md_path)
+    if cached and cached[0] == sig:
+        return cached[1]
+    entry = render(md_path)
+    _entry_cache[md_path] = (sig, entry)
+    return entry
+
+
+def _sorted_entries(root: Path, dirs: bool) -> list[os.DirEntry]:
+    """Directory (or file) entries of root sorted by name, via one os.scandir pass.
+
+    DirEntry caches the file type from readdir, so no extra stat() per entry.
+    """
+    with os.scandir(root) as it:
+        if dirs:
+            entries = [e for e in it if e.is_dir()]
+        else:
+            entries = [e for e in it if e.is_file()]
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def _scan_map(fn, items: list) -> list:
+    """map() fn over items on a small thread pool so the file reads overlap."""
+    if len(items) < 2:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(16, len(items))) as ex:
+        return list(ex.map(fn, items))
+
+
+def _render_subagent(sub_md: Path) -> tuple[str, str]:
+    """Render a subagent entry from its SUBAGENT.md.
+
+    Returns (head, tail) so the live task counts can be spliced in between.
+    """
+    sub_dir = sub_md.parent
+    meta = _parse_frontmatter(_read_frontmatter(sub_md))
+    desc = meta.get("description") or ""
+    provider = (meta.get("provider") or "auto").split()[0]
+    task_type = (meta.get("task_type") or "general").split()[0]
+    tools_list = meta.get("tools") if isinstance(meta.get("tools"), list) else None
+
+    if len(desc) > 150:
+        desc = desc[:147] + "..."
+
+    head = f"- **{sub_dir.name}**: {desc}" if desc else f"- **{sub_dir.name}**"
+    head = f"{head} [{provider}, {task_type}]"
+
+    tail = []
+    # Tools restriction
+    if tools_list:
+        tail.append(f"\n  Tools: {', '.join(tools_list)}")
+
+    # List scripts if present
+    scripts_dir = sub_dir / "scripts"
+    if scripts_dir.exists():
+        script_names = [e.name for e in _sorted_entries(scripts_dir, dirs=False)]
+        if script_names:
+            tail.append(f"\n  Scripts: {', '.join(script_names[:5])}")
+
+    return head, "".join(tail)
+
+
+def _scan_installed_subagents(mem=None) -> str:
     """Scan proactive/subagents/ directory and build compact subagent catalog.
 
     Each subagent has a SUBAGENT.md with YAML frontmatter (name, description, provider, task_type).
     Full content is NOT included — agent should run `agelclaw-mem subagent_content <name>`.
+    `mem` is the Memory used for task counts (defaults to the shared instance).
     """
-    import re as _re
-
     subagents_root = get_subagents_dir()
     if not subagents_root.exists():
         return ""
 
     # Get memory instance for task counts
-    from agelclaw.memory import Memory as _Memory
-    _mem = _Memory()
+    if mem is None:
+        mem = _get_memory()
 
-    entries = []
-    for sub_dir in sorted(subagents_root.iterdir()):
-        if not sub_dir.is_dir():
-            continue
-        sub_md = sub_dir / "SUBAGENT.md"
-        if not sub_md.exists():
-            continue
+    sub_mds = []
+    for entry in _sorted_entries(subagents_root, dirs=True):
+        sub_md = Path(entry.path) / "SUBAGENT.md"
+        if sub_md.exists():
+            sub_mds.append(sub_md)
+
+    def _process_subagent(sub_md: Path):
         try:
-            content = sub_md.read_text(encoding="utf-8", errors="replace").strip()
-
-            # Extract YAML frontmatter
-            fm_match = _re.search(r'^---\s*\n(.*?)\n---', content, _re.DOTALL)
-            desc = ""
-            provider = "auto"
-            task_type = "general"
-            tools_list = None
-            if fm_match:
-                fm = fm_match.group(1)
-                # description
-                d = _re.search(r'description:\s*>-?\s*\n\s+(.+?)(?:\n\S|\n---|\Z)', fm, _re.DOTALL)
-                if d:
-                    desc = " ".join(d.group(1).split())
-                else:
-                    d = _re.search(r'description:\s*(.+)', fm)
-                    if d:
-                        desc = d.group(1).strip().strip('"\'')
-                # provider
-                p = _re.search(r'provider:\s*(\S+)', fm)
-                if p:
-                    provider = p.group(1).strip()
-                # task_type
-                t = _re.search(r'task_type:\s*(\S+)', fm)
-                if t:
-                    task_type = t.group(1).strip()
-                # tools (YAML list)
-                tools_match = _re.search(r'tools:\s*\n((?:\s+-\s+\S+\n?)+)', fm)
-                if tools_match:
-                    tools_list = [line.strip().lstrip("- ") for line in tools_match.group(1).strip().splitlines() if line.strip()]
-
-            if len(desc) > 150:
-                desc = desc[:147] + "..."
-
-            entry = f"- **{sub_dir.name}**: {desc}" if desc else f"- **{sub_dir.name}**"
-            entry += f" [{provider}, {task_type}]"
-
-            # Task counts
-            sa_stats = _mem.get_subagent_stats(sub_dir.name)
-            pending_count = sa_stats.get("pending", 0)
-            if sa_stats.get("total", 0) > 0:
-                entry += f" | tasks: {pending_count} pending, {sa_stats.get('total', 0)} total"
-
-            # Tools restriction
-            if tools_list:
-                entry += f"\n  Tools: {', '.join(tools_list)}"
-
-            # List scripts if present
-            scripts_dir = sub_dir / "scripts"
-            if scripts_dir.exists():
-                script_names = [f.name for f in sorted(scripts_dir.iterdir()) if f.is_file()]
-                if script_names:
-                    entry += f"\n  Scripts: {', '.join(script_names[:5])}"
-
-            entries.append(entry)
+            head, tail = _cached_entry(sub_md, sub_md.parent / "scripts", _render_subagent)
+            return sub_md.parent.name, head, tail
         except Exception:
-            continue
+            return None
+
+    rendered = [r for r in _scan_map(_process_subagent, sub_mds) if r]
+
+    # Task counts for every subagent in one query
+    try:
+        all_stats = mem.get_subagent_stats_bulk([name for name, _, _ in rendered])
+    except Exception:
+        all_stats = {}
+
+    entries = []
+    for name, head, tail in rendered:
+        sa_stats = all_stats.get(name, {})
+        pending_count = sa_stats.get("pending", 0)
+        counts = ""
+        if sa_stats.get("total", 0) > 0:
+            counts = f" | tasks: {pending_count} pending, {sa_stats.get('total', 0)} total"
+        entries.append("".join((head, counts, tail)))
 
     if not entries:
         return ""
@@ -340,77 +496,63 @@ def _scan_installed_subagents() -> str:
     return header + "\n".join(entries)
 
 
+def _render_skill(skill_md: Path) -> str:
+    """Render a compact catalog entry from a SKILL.md."""
+    skill_dir = skill_md.parent
+    # Extract description from YAML frontmatter
+    desc = _parse_frontmatter(_read_frontmatter(skill_md)).get("description", "")
+
+    # List available scripts
+    scripts_dir = skill_dir / "scripts"
+    script_names = []
+    if scripts_dir.exists():
+        script_names = [e.name for e in _sorted_entries(scripts_dir, dirs=False)]
+
+    # Build compact entry
+    parts = [f"- **{skill_dir.name}**"]
+    if desc:
+        # Truncate long descriptions
+        if len(desc) > 150:
+            desc = desc[:147] + "..."
+        parts.append(f": {desc}")
+    if script_names:
+        scripts_str = ", ".join(script_names[:5])
+        if len(script_names) > 5:
+            scripts_str += f" (+{len(script_names)-5} more)"
+        parts.append(f"\n  Scripts: {scripts_str}")
+        parts.append(f"\n  Path: {skill_dir}")
+
+    return "".join(parts)
+
+
 def _scan_installed_skills() -> str:
     """Scan .Claude/Skills/ directories and build compact skill catalog.
 
     Only includes: name, description (from YAML frontmatter), script names, and path.
     Full SKILL.md content is NOT included to keep the prompt small.
     The agent should run `agelclaw-mem skill_content <name>` to get full details.
+    Entries are cached per file and only re-read when SKILL.md or scripts/ changes.
     """
-    import re as _re
-
     skill_dirs = [
         get_skills_dir(),   # project skills
         Path.home() / ".claude" / "skills",             # user skills
     ]
-    skills_text = []
-
+    skill_mds = []
     for skills_root in skill_dirs:
         if not skills_root.exists():
             continue
-        for skill_dir in sorted(skills_root.iterdir()):
-            if not skill_dir.is_dir():
-                continue
-            skill_md = skill_dir / "SKILL.md"
-            if not skill_md.exists():
-                continue
-            try:
-                content = skill_md.read_text(encoding="utf-8", errors="replace").strip()
-
-                # Extract description from YAML frontmatter
-                desc = ""
-                fm_match = _re.search(
-                    r'^---\s*\n(.*?)\n---', content, _re.DOTALL
-                )
-                if fm_match:
-                    fm = fm_match.group(1)
-                    # Get description field
-                    desc_match = _re.search(
-                        r'description:\s*>-?\s*\n\s+(.+?)(?:\n\S|\n---|\Z)',
-                        fm, _re.DOTALL
-                    )
-                    if desc_match:
-                        desc = desc_match.group(1).strip()
-                        desc = " ".join(desc.split())  # collapse whitespace
-                    else:
-                        # Single-line description
-                        desc_match = _re.search(r'description:\s*(.+)', fm)
-                        if desc_match:
-                            desc = desc_match.group(1).strip().strip('"\'')
-
-                # List available scripts
-                scripts_dir = skill_dir / "scripts"
-                script_names = []
-                if scripts_dir.exists():
-                    script_names = [f.name for f in sorted(scripts_dir.iterdir()) if f.is_file()]
-
-                # Build compact entry
-                skill_entry = f"- **{skill_dir.name}**"
-                if desc:
-                    # Truncate long descriptions
-                    if len(desc) > 150:
-                        desc = desc[:147] + "..."
-                    skill_entry += f": {desc}"
-                if script_names:
-                    scripts_str = ", ".join(script_names[:5])
-                    if len(script_names) > 5:
-                        scripts_str += f" (+{len(script_names)-5} more)"
-                    skill_entry += f"\n  Scripts: {scripts_str}"
-                    skill_entry += f"\n  Path: {skill_dir}"
-
-                skills_text.append(skill_entry)
-            except Exception:
-                continue
+        for entry in _sorted_entries(skills_root, dirs=True):
+            skill_md = Path(entry.path) / "SKILL.md"
+            if skill_md.exists():
+                skill_mds.append(skill_md)
+
+    def _process_skill(skill_md: Path):
+        try:
+            return _cached_entry(skill_md, skill_md.parent / "scripts", _render_skill)
+        except Exception:
+            return None
+
+    skills_text = [e for e in _scan_map(_process_skill, skill_mds) if e]
 
     if not skills_text:
         return ""
@@ -421,9 +563,62 @@ def _scan_installed_skills() -> str:
     return header + "\n".join(skills_text)
 
 
-import time as _time
 _prompt_cache = {"text": None, "ts": 0}
 _PROMPT_CACHE_TTL = 120  # seconds — rebuild every 2 min
+_prompt_lock = threading.Lock()
+
+# The composed prompt is also shared on disk, so the API server, telegram bot
+# and daemon don't each rebuild it every TTL window.
+_PROMPT_CACHE_FILE = DB_PATH.parent / "prompt_cache.json"
+
+
+def _prompt_fingerprint() -> str:
+    """Hash of the mtimes of everything the prompt is built from on disk."""
+    h = hashlib.sha1()
+    sources = (
+        (get_skills_dir(), "SKILL.md"),
+        (Path.home() / ".claude" / "skills", "SKILL.md"),
+        (get_subagents_dir(), "SUBAGENT.md"),
+        (get_persona_dir(), None),
+    )
+    for root, marker in sources:
+        try:
+            h.update(f"{root}:{root.stat().st_mtime_ns};".encode())
+            with os.scandir(root) as it:
+                for entry in it:
+                    target = os.path.join(entry.path, marker) if marker else entry.path
+                    try:
+                        st = os.stat(target)
+                    except OSError:
+                        continue
+                    h.update(f"{entry.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+        except OSError:
+            continue
+    return h.hexdigest()
+
+
+def _load_shared_prompt(fingerprint: str, now: float) -> dict | None:
+    """Return the on-disk prompt cache if it is fresh and matches fingerprint."""
+    try:
+        data = json.loads(_PROMPT_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != fingerprint or (now - data.get("ts", 0)) >= _PROMPT_CACHE_TTL:
+        return None
+    return data if data.get("text") else None
+
+
+def _save_shared_prompt(text: str, ts: float, fingerprint: str) -> None:
+    """Atomically publish the composed prompt for other processes."""
+    tmp = _PROMPT_CACHE_FILE.with_name(f"{_PROMPT_CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(
+            json.dumps({"text": text, "ts": ts, "fingerprint": fingerprint}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, _PROMPT_CACHE_FILE)
+    except OSError:
+        tmp.unlink(missing_ok=True)
 
 
 def _load_persona_files() -> str:
@@ -471,29 +666,62 @@ def _check_bootstrap() -> str:
 
 def get_system_prompt() -> str:
     """Build the full system prompt with persona, skills, subagents, and hard rules.
-    Cached for 120s to avoid filesystem scanning on every message."""
+    Cached for 120s to avoid filesystem scanning on every message; on rebuild,
+    unchanged SKILL.md / SUBAGENT.md files are only stat()ed, not re-read.
+    The result is shared with other processes through _PROMPT_CACHE_FILE."""
     now = _time.time()
     if _prompt_cache["text"] and (now - _prompt_cache["ts"]) < _PROMPT_CACHE_TTL:
         return _prompt_cache["text"]
 
-    from agelclaw.memory import Memory
-    mem = Memory()
-    result = (
-        _load_persona_files()
-        + _check_bootstrap()
-        + _SYSTEM_PROMPT_BASE
-        + _scan_installed_skills()
-        + _scan_installed_subagents()
-        + mem.build_rules_prompt()
-    )
-    _prompt_cache["text"] = result
-    _prompt_cache["ts"] = now
-    return result
+    # Single flight: one thread rebuilds, concurrent callers wait and reuse it
+    with _prompt_lock:
+        now = _time.time()
+        if _prompt_cache["text"] and (now - _prompt_cache["ts"]) < _PROMPT_CACHE_TTL:
+            return _prompt_cache["text"]
+
+        fingerprint = _prompt_fingerprint()
+        shared = _load_shared_prompt(fingerprint, now)
+        if shared:
+            _prompt_cache["text"] = shared["text"]
+            _prompt_cache["ts"] = shared["ts"]
+            return shared["text"]
+
+        mem = _get_memory()
+        # Both catalogs are independent directory scans — run them side by side
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            skills_f = ex.submit(_scan_installed_skills)
+            subagents_f = ex.submit(_scan_installed_subagents, mem)
+            skills_text, subagents_text = skills_f.result(), subagents_f.result()
+        result = "".join((
+            _load_persona_files(),
+            _check_bootstrap(),
+            _SYSTEM_PROMPT_BASE,
+            skills_text,
+            subagents_text,
+            mem.build_rules_prompt(),
+        ))
+        _prompt_cache["text"] = result
+        _prompt_cache["ts"] = now
+        _save_shared_prompt(result, now, fingerprint)
+        return result
 
 
 # SYSTEM_PROMPT is now dynamic — use get_system_prompt() instead
-# This static alias is kept for backwards compatibility at import time
-SYSTEM_PROMPT = get_system_prompt()
+# The alias is kept for backwards compatibility and resolved lazily (PEP 562),
+# so importing this module no longer scans skills or touches the database.
+def __getattr__(name: str):
+    if name == "SYSTEM_PROMPT":
+        return get_system_prompt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Speaker label indexed by `role == "user"`
+_PREFIX = ("Assistant", "User")
+
+
+def _trunc(s: str, n: int) -> str:
+    """Cut s to n characters, marking the cut with '...'."""
+    return s if len(s) <= n else s[:n] + "..."
 
 
 def build_prompt_with_history(user_text: str, memory, channel_type: str = "private") -> str:
@@ -523,7 +751,7 @@ def build_prompt_with_history(user_text: str, memory, channel_type: str = "priva
     if not recent:
         return user_text
 
-    # Fast keyword recall from older conversations — SQLite LIKE only, no embedding API
+    # Fast keyword recall from older conversations — SQLite FTS5/LIKE only, no embedding API
     relevant_older = _find_relevant_history_fast(user_text, session_id, recent)
 
     context_parts = []
@@ -531,18 +759,15 @@ def build_prompt_with_history(user_text: str, memory, channel_type: str = "priva
     if relevant_older and channel_type != "group":
         context_parts.append("=== Relevant earlier conversation ===")
         for msg in relevant_older:
-            prefix = "User" if msg["role"] == "user" else "Assistant"
-            content = msg["content"]
-            if len(content) > 800:
-                content = content[:800] + "..."
-            context_parts.append(f"{prefix}: {content}")
+            prefix = _PREFIX[msg["role"] == "user"]
+            context_parts.append(f"{prefix}: {_trunc(msg['content'], 800)}")
         context_parts.append("\n=== Recent conversation ===")
 
     for msg in recent:
-        prefix = "User" if msg["role"] == "user" else "Assistant"
+        prefix = _PREFIX[msg["role"] == "user"]
         content = msg["content"]
-        if msg["role"] == "assistant" and len(content) > 1500:
-            content = content[:1500] + "..."
+        if msg["role"] == "assistant":
+            content = _trunc(content, 1500)
         context_parts.append(f"{prefix}: {content}")
 
     context_parts.append(f"\nUser (latest): {user_text}")
@@ -559,46 +784,65 @@ def build_prompt_with_history(user_text: str, memory, channel_type: str = "priva
     )
 
 
+# Filler words (Greek + English) that never make useful recall keywords
+_SKIP_WORDS: frozenset[str] = frozenset({
+    "θέλω", "μπορείς", "κάνε", "πες", "βρες", "στείλε", "δείξε",
+    "αυτό", "αυτά", "εδώ", "εκεί", "τώρα", "μετά", "πριν",
+    "that", "this", "have", "with", "from", "what", "send", "show",
+    "please", "can", "the", "and", "for", "you", "are", "was",
+})
+_PUNCT_TABLE = str.maketrans("", "", ".,;:!?\"'()")
+_MAX_RECALL_KEYWORDS = 8
+
+
 def _find_relevant_history_fast(user_text: str, session_id: str, recent_msgs: list) -> list:
     """Fast keyword-based recall from older conversation history.
 
-    Uses SQLite LIKE queries only — no external API calls, <5ms.
+    Uses the conversations_fts FTS5 index (BM25-ranked), falling back to
+    SQLite LIKE queries when it is missing — no external API calls, <5ms.
     For deeper semantic search the agent can run `agelclaw-mem search` on-demand.
     """
     recent_ids = {msg.get("id") for msg in recent_msgs if msg.get("id")}
 
-    skip_words = {
-        "θέλω", "μπορείς", "κάνε", "πες", "βρες", "στείλε", "δείξε",
-        "αυτό", "αυτά", "εδώ", "εκεί", "τώρα", "μετά", "πριν",
-        "that", "this", "have", "with", "from", "what", "send", "show",
-        "please", "can", "the", "and", "for", "you", "are", "was",
-    }
-    words = [w.lower().strip(".,;:!?\"'()") for w in user_text.split() if len(w) > 3]
-    keywords = [w for w in words if w not in skip_words]
+    cleaned = user_text.translate(_PUNCT_TABLE).lower()
+    keywords = [w for w in cleaned.split() if len(w) > 3 and w not in _SKIP_WORDS]
+    # Drop repeats (order-preserving) and bound the OR fan-out of the query
+    keywords = list(dict.fromkeys(keywords))[:_MAX_RECALL_KEYWORDS]
 
     if not keywords:
         return []
 
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-
-        like_clauses = " OR ".join(["content LIKE ?"] * len(keywords))
-        params = [f"%{kw}%" for kw in keywords]
-        params.append(session_id)
-
-        rows = conn.execute(
-            f"""SELECT * FROM conversations
-                WHERE ({like_clauses})
-                AND session_id = ?
-                ORDER BY created_at DESC
-                LIMIT 20""",
-            params,
-        ).fetchall()
-        conn.close()
-
-        older = [dict(r) for r in rows if r["id"] not in recent_ids]
-        return list(reversed(older[:6]))
+        conn = _get_conn()
+        try:
+            # Inverted-index lookup; each keyword is quoted and prefix-matched
+            match = " OR ".join('"' + kw.replace('"', '""') + '"*' for kw in keywords)
+            rows = conn.execute(
+                """SELECT c.* FROM conversations_fts f
+                    JOIN conversations c ON c.id = f.rowid
+                    WHERE conversations_fts MATCH ?
+                    AND f.session_id = ?
+                    ORDER BY rank
+                    LIMIT 20""",
+                (match, session_id),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # No FTS5 table (or no FTS5 support) — fall back to a LIKE scan
+            like_clauses = " OR ".join(["content LIKE ?"] * len(keywords))
+            params = [f"%{kw}%" for kw in keywords]
+            params.append(session_id)
+
+            rows = conn.execute(
+                f"""SELECT * FROM conversations
+                    WHERE ({like_clauses})
+                    AND session_id = ?
+                    ORDER BY created_at DESC
+                    LIMIT 20""",
+                params,
+            ).fetchall()
+
+        older = [dict(r) for r in rows if r["id"] not in recent_ids][:6]
+        return sorted(older, key=lambda r: r["id"])
     except Exception:
         return []
 
@@ -611,14 +855,13 @@ def get_system_prompt_for_channel(channel_type: str = "private") -> str:
     """
     if channel_type == "group":
         # Group mode: base prompt + skills + subagents + rules, but NO persona files
-        from agelclaw.memory import Memory
-        mem = Memory()
-        return (
-            _SYSTEM_PROMPT_BASE
-            + _scan_installed_skills()
-            + _scan_installed_subagents()
-            + mem.build_rules_prompt()
-        )
+        mem = _get_memory()
+        return "".join((
+            _SYSTEM_PROMPT_BASE,
+            _scan_installed_skills(),
+            _scan_installed_subagents(mem),
+            mem.build_rules_prompt(),
+        ))
     return get_system_prompt()
 
 
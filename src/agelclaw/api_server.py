@@ -17,12 +17,20 @@ import re
 import sys
 import io
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
+import httpx
+import yaml
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -44,7 +52,7 @@ from agelclaw.core.agent_router import Provider
 from agelclaw.memory import Memory
 
 # ── Config ───────────────────────────────────────────────────────────
-from agelclaw.project import get_react_dist_dir, get_project_dir
+from agelclaw.project import get_react_dist_dir, get_project_dir, get_skills_dir
 REACT_BUILD_DIR = get_react_dist_dir()
 _cfg = load_config()
 API_PORT = _cfg.get("api_port", 8000)
@@ -52,8 +60,178 @@ DAEMON_PORT = _cfg.get("daemon_port", 8420)
 
 memory = Memory()
 
+# ── SSE frames ───────────────────────────────────────────────────────
+# Constant frames are built once; dynamic ones go straight to UTF-8 bytes
+_SSE_DONE = b"data: [DONE]\n\n"
+_KEEPALIVE = b": keepalive\n\n"
+
+
+def _sse(event: dict) -> bytes:
+    """Encode one SSE data frame as bytes (orjson when available)."""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(event) + b"\n\n"
+    return b"data: " + json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode() + b"\n\n"
+
+
+# Long tool-use pauses produce no frames; proxies drop idle connections
+_KEEPALIVE_INTERVAL = 15
+_STREAM_END = object()
+
+
+async def _with_keepalive(frames, interval: float = _KEEPALIVE_INTERVAL):
+    """Relay an SSE frame generator, emitting keepalive comments while it is idle.
+
+    The generator runs in its own task feeding a queue; it is cancelled if
+    the client goes away.
+    """
+    q: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for frame in frames:
+                q.put_nowait(frame)
+        finally:
+            q.put_nowait(_STREAM_END)
+
+    producer = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(q.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield _KEEPALIVE
+                continue
+            if frame is _STREAM_END:
+                break
+            yield frame
+    finally:
+        producer.cancel()
+
+
+class _OrjsonResponse(JSONResponse):
+    """JSON response rendered by orjson (fastapi's ORJSONResponse is deprecated)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# ── Admission control ────────────────────────────────────────────────
+class Admission:
+    """Counter + condition variable bounding concurrent agent queries.
+
+    Unlike asyncio.Semaphore the limit can be changed at runtime
+    (set_cmax), e.g. when max_concurrent_tasks is saved in settings.
+    """
+
+    def __init__(self, cmax: int):
+        self._active = 0
+        self._cmax = max(1, cmax)
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._cmax)
+            self._active += 1
+
+    async def release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_cmax(self, cmax: int):
+        async with self._cond:
+            self._cmax = max(1, cmax)
+            self._cond.notify_all()
+
+
+admission = Admission(int(_cfg.get("max_concurrent_tasks", 3)))
+
+# One pooled client for every call to the daemon (keep-alive, no per-request handshake)
+_daemon_client: httpx.AsyncClient | None = None
+
+
+def _get_daemon_client() -> httpx.AsyncClient:
+    global _daemon_client
+    if _daemon_client is None or _daemon_client.is_closed:
+        _daemon_client = httpx.AsyncClient(
+            base_url=f"http://localhost:{DAEMON_PORT}",
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _daemon_client
+
+
+# ── Conversation log writer ──────────────────────────────────────────
+# Streams hand their log rows to one background writer instead of
+# committing to SQLite before [DONE]; FIFO keeps user/assistant order.
+_log_q: asyncio.Queue | None = None
+_log_task: asyncio.Task | None = None
+
+
+async def _log_writer():
+    while True:
+        batch = [await _log_q.get()]
+        while not _log_q.empty():
+            batch.append(_log_q.get_nowait())
+        try:
+            await asyncio.to_thread(memory.log_conversation_many, batch)
+        except Exception as e:
+            print(f"[api] conversation log write failed: {e}", file=sys.stderr)
+        finally:
+            for _ in batch:
+                _log_q.task_done()
+
+
+def _queue_log(**kwargs):
+    """Queue a memory.log_conversation call (written inline if no writer runs)."""
+    if _log_q is None:
+        memory.log_conversation(**kwargs)
+    else:
+        _log_q.put_nowait(kwargs)
+
+
+class _LogBuffer:
+    """Streamed reply text kept for the conversation log, capped at `cap` chars.
+
+    Chunks past the cap are dropped as they arrive instead of joining the
+    whole reply only to slice it.
+    """
+
+    __slots__ = ("parts", "room")
+
+    def __init__(self, cap: int = 2000):
+        self.parts: list[str] = []
+        self.room = cap
+
+    def append(self, text: str):
+        if self.room > 0:
+            self.parts.append(text[:self.room])
+            self.room -= len(text)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _log_q, _log_task
+    _get_daemon_client()
+    _log_q = asyncio.Queue()
+    _log_task = asyncio.create_task(_log_writer())
+    yield
+    await _log_q.join()  # flush pending logs before shutdown
+    _log_task.cancel()
+    _log_q = None
+    if _daemon_client is not None:
+        await _daemon_client.aclose()
+
+
 # ── FastAPI App ──────────────────────────────────────────────────────
-app = FastAPI(title="Claude Agent Chat API")
+app = FastAPI(
+    title="Claude Agent Chat API",
+    lifespan=lifespan,
+    default_response_class=_OrjsonResponse if orjson is not None else JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -78,61 +256,60 @@ class ChatRequest(BaseModel):
 
 # ── Chat-based task control (natural language stop/update) ───────────
 
-_STOP_PATTERNS = [
-    re.compile(r"(?:σταμ[αά]τ[αη]|σταμάτησε|ακύρωσε|ακυρωσε|cancel|stop|kill|abort)\s+(?:(?:το\s+)?(?:task|#)\s*(\d+)|(\d+))", re.IGNORECASE),
-    re.compile(r"(?:task|#)\s*(\d+)\s+(?:σταμ[αά]τ[αη]|cancel|stop|kill|abort)", re.IGNORECASE),
-]
+# Each intent is one alternation of its phrasings, so a message is scanned once.
+_STOP_PHRASES = (
+    r"(?:σταμ[αά]τ[αη]|σταμάτησε|ακύρωσε|ακυρωσε|cancel|stop|kill|abort)\s+(?:(?:το\s+)?(?:task|#)\s*(?P<id1>\d+)|(?P<id2>\d+))",
+    r"(?:task|#)\s*(?P<id3>\d+)\s+(?:σταμ[αά]τ[αη]|cancel|stop|kill|abort)",
+)
+_STOP_RE = re.compile("|".join(f"(?:{p})" for p in _STOP_PHRASES), re.IGNORECASE)
+
+_UPDATE_PHRASES = (
+    r"(?:άλλαξε|αλλαξε|update|change)\s+(?:(?:το\s+)?(?:task|#)\s*(?P<id1>\d+)|(?P<id2>\d+))\s+(?P<msg1>.+)",
+    r"(?:task|#)\s*(?P<id3>\d+)\s+(?:άλλαξε|αλλαξε|update|change)\s+(?P<msg2>.+)",
+    r"(?:στο\s+)?(?:task|#)\s*(?P<id4>\d+)\s*[,:]\s+(?P<msg3>.+)",
+)
+_UPDATE_RE = re.compile("|".join(f"(?:{p})" for p in _UPDATE_PHRASES), re.IGNORECASE | re.DOTALL)
 
-_UPDATE_PATTERNS = [
-    re.compile(r"(?:άλλαξε|αλλαξε|update|change)\s+(?:(?:το\s+)?(?:task|#)\s*(\d+)|(\d+))\s+(.+)", re.IGNORECASE | re.DOTALL),
-    re.compile(r"(?:task|#)\s*(\d+)\s+(?:άλλαξε|αλλαξε|update|change)\s+(.+)", re.IGNORECASE | re.DOTALL),
-    re.compile(r"(?:στο\s+)?(?:task|#)\s*(\d+)\s*[,:]\s+(.+)", re.IGNORECASE | re.DOTALL),
-]
+# Substrings every matching message must contain (checked on the lowercased text)
+# — most chat messages fail these and never reach the regexes.
+_STOP_HINTS = ("σταμ", "ακύρ", "ακυρ", "cancel", "stop", "kill", "abort")
+_UPDATE_HINTS = ("άλλαξ", "αλλαξ", "update", "change", "task", "#")
 
 
 def _detect_stop_intent(text: str) -> int | None:
-    for pat in _STOP_PATTERNS:
-        m = pat.search(text)
-        if m:
-            for g in m.groups():
-                if g and g.isdigit():
-                    return int(g)
-    return None
+    m = _STOP_RE.search(text)
+    if not m:
+        return None
+    return int(m.group("id1") or m.group("id2") or m.group("id3"))
 
 
 def _detect_update_intent(text: str) -> tuple[int, str] | None:
-    for pat in _UPDATE_PATTERNS:
-        m = pat.search(text)
-        if m:
-            groups = m.groups()
-            task_id = None
-            msg = None
-            for g in groups:
-                if g is None:
-                    continue
-                if g.strip().isdigit() and task_id is None:
-                    task_id = int(g.strip())
-                elif task_id is not None:
-                    msg = g.strip()
-                    break
-            if task_id and msg:
-                return (task_id, msg)
+    m = _UPDATE_RE.search(text)
+    if not m:
+        return None
+    task_id = int(m.group("id1") or m.group("id2") or m.group("id3") or m.group("id4"))
+    msg = (m.group("msg1") or m.group("msg2") or m.group("msg3")).strip()
+    if task_id and msg:
+        return (task_id, msg)
     return None
 
 
 async def _daemon_request(method: str, path: str, json_data: dict = None) -> dict | None:
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            url = f"http://localhost:{DAEMON_PORT}{path}"
-            if method == "GET":
-                resp = await client.get(url)
-            else:
-                resp = await client.post(url, json=json_data)
-            return {"status_code": resp.status_code, "data": resp.json()}
+        client = _get_daemon_client()
+        if method == "GET":
+            resp = await client.get(path)
+        else:
+            resp = await client.post(path, json=json_data)
+        return {"status_code": resp.status_code, "data": resp.json()}
     except Exception:
         return None
 
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+_SAFE_NAME_RE = re.compile(r"[^\w\-.]")
+
+
 def _get_uploads_dir() -> Path:
     d = get_project_dir() / "uploads"
     d.mkdir(parents=True, exist_ok=True)
@@ -182,17 +359,28 @@ async def get_config():
 
 
 # ── Settings API ─────────────────────────────────────────────────────
+_cfg_cache = {"t": 0.0, "v": None}
+_CFG_CACHE_TTL = 2.0  # seconds
+
+
+def _cached_config(ttl: float = _CFG_CACHE_TTL) -> dict:
+    """Fresh-from-disk config, re-read at most once per ttl seconds."""
+    now = time.monotonic()
+    if _cfg_cache["v"] is None or now - _cfg_cache["t"] > ttl:
+        _cfg_cache["v"] = load_config(force_reload=True)
+        _cfg_cache["t"] = now
+    return _cfg_cache["v"]
+
+
 def _mask_key(key: str) -> str:
     """Mask a secret key for display (show first 4 and last 4 chars)."""
-    if not key or len(key) < 8:
-        return ""
-    return key[:4] + "***" + key[-4:]
+    return f"{key[:4]}***{key[-4:]}" if key and len(key) >= 8 else ""
 
 
 @app.get("/api/settings")
 async def get_settings():
     """Return config with masked secrets."""
-    cfg = load_config(force_reload=True)
+    cfg = _cached_config()
     return {
         "anthropic_api_key": _mask_key(cfg.get("anthropic_api_key", "")),
         "openai_api_key": _mask_key(cfg.get("openai_api_key", "")),
@@ -230,27 +418,30 @@ async def post_settings(data: dict):
 
     save_config(cfg)
     save_env_file(cfg)
+    _cfg_cache["v"] = cfg
+    _cfg_cache["t"] = time.monotonic()
+    await admission.set_cmax(int(cfg.get("max_concurrent_tasks", 3)))
     return {"status": "saved"}
 
 
 @app.get("/api/services/status")
 async def services_status():
     """Check which services are currently running via port check."""
-    import socket
-
     cfg = load_config()
 
-    def _port_open(port: int) -> bool:
+    async def _port_open(port: int) -> bool:
+        # Non-blocking probe: a slow or filtered port must not stall the event loop
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(0.5)
-                return s.connect_ex(("127.0.0.1", port)) == 0
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), 0.5)
+            writer.close()
+            await writer.wait_closed()
+            return True
         except Exception:
             return False
 
     return {
         "api_server": True,  # We're responding, so it's running
-        "daemon": _port_open(cfg.get("daemon_port", 8420)),
+        "daemon": await _port_open(cfg.get("daemon_port", 8420)),
         "telegram": False,  # TODO: check telegram bot process
     }
 
@@ -272,12 +463,16 @@ async def control_service(service: str, action: str):
                 if svc == "daemon":
                     port = cfg.get("daemon_port", 8420)
                     if sys.platform == "win32":
-                        subprocess.run(
-                            f'for /f "tokens=5" %a in (\'netstat -aon ^| findstr :{port}\') do taskkill /F /PID %a',
-                            shell=True, capture_output=True,
-                        )
+                        cmd = f'for /f "tokens=5" %a in (\'netstat -aon ^| findstr :{port}\') do taskkill /F /PID %a'
                     else:
-                        subprocess.run(f"fuser -k {port}/tcp", shell=True, capture_output=True)
+                        cmd = f"fuser -k {port}/tcp"
+                    # Async subprocess: the kill can take a while, keep serving meanwhile
+                    proc = await asyncio.create_subprocess_shell(
+                        cmd,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL,
+                    )
+                    await proc.wait()
                 results[svc] = "stopped"
 
             if action in ("start", "restart"):
@@ -287,7 +482,7 @@ async def control_service(service: str, action: str):
                 }.get(svc)
                 if script:
                     script_path = PROACTIVE_DIR / script
-                    if script_path.exists():
+                    if await asyncio.to_thread(script_path.exists):
                         python = sys.executable
                         subprocess.Popen(
                             [python, str(script_path)],
@@ -307,55 +502,72 @@ async def control_service(service: str, action: str):
     return {"results": results}
 
 
+# Skills rarely change between requests: reuse the last scan while the
+# directory and every SKILL.md keep the same mtime.
+_skills_cache: dict = {"sig": None, "data": None}
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _skills_signature(skills_dir: Path) -> tuple:
+    entries = []
+    with os.scandir(skills_dir) as it:
+        for entry in it:
+            if entry.is_dir():
+                try:
+                    mtime = os.stat(os.path.join(entry.path, "SKILL.md")).st_mtime_ns
+                except OSError:
+                    mtime = 0
+                entries.append((entry.name, mtime))
+    return skills_dir.stat().st_mtime_ns, tuple(sorted(entries))
+
+
+def _read_skill(entry: Path) -> dict:
+    skill_md = entry / "SKILL.md"
+    name = entry.name
+    description = ""
+    if skill_md.exists():
+        try:
+            text = skill_md.read_text(encoding="utf-8", errors="replace")
+            # Parse YAML frontmatter
+            if text.startswith("---"):
+                parts = text.split("---", 2)
+                if len(parts) >= 3:
+                    meta = yaml.load(parts[1], Loader=_YAML_LOADER)
+                    if isinstance(meta, dict):
+                        name = str(meta.get("name") or name)
+                        description = str(meta.get("description") or "").strip()
+        except Exception:
+            pass
+    if not description:
+        description = f"Agent skill: {name}"
+    return {
+        "status": "ready",
+        "icon": "🧩",
+        "name": name,
+        "description": description,
+        "source": "project",
+    }
+
+
+def _scan_skills_sync() -> list[dict]:
+    skills_dir = get_skills_dir()
+    if not skills_dir.exists():
+        return []
+    sig = _skills_signature(skills_dir)
+    if _skills_cache["sig"] == sig:
+        return _skills_cache["data"]
+    result = [_read_skill(entry) for entry in sorted(skills_dir.iterdir()) if entry.is_dir()]
+    _skills_cache["sig"] = sig
+    _skills_cache["data"] = result
+    return result
+
+
 @app.get("/api/skills")
 async def skills():
     """Dynamically scan .Claude/Skills/ and return installed skills."""
-    skills_dir = get_skills_dir()
-    result = []
-    if skills_dir.exists():
-        for entry in sorted(skills_dir.iterdir()):
-            if not entry.is_dir():
-                continue
-            skill_md = entry / "SKILL.md"
-            name = entry.name
-            description = ""
-            if skill_md.exists():
-                try:
-                    text = skill_md.read_text(encoding="utf-8", errors="replace")
-                    # Parse YAML frontmatter
-                    if text.startswith("---"):
-                        parts = text.split("---", 2)
-                        if len(parts) >= 3:
-                            for line in parts[1].strip().splitlines():
-                                if line.startswith("name:"):
-                                    name = line.split(":", 1)[1].strip()
-                                elif line.startswith("description:"):
-                                    desc = line.split(":", 1)[1].strip()
-                                    if desc and desc != ">-":
-                                        description = desc
-                            # Handle multi-line description (YAML >- style)
-                            if not description:
-                                in_desc = False
-                                for line in parts[1].strip().splitlines():
-                                    if line.startswith("description:"):
-                                        in_desc = True
-                                        continue
-                                    if in_desc:
-                                        if line and not line[0].isalpha() or line.startswith("  "):
-                                            description = line.strip()
-                                            break
-                except Exception:
-                    pass
-            if not description:
-                description = f"Agent skill: {name}"
-            result.append({
-                "status": "ready",
-                "icon": "🧩",
-                "name": name,
-                "description": description,
-                "source": "project",
-            })
-    return result
+    # Disk I/O runs off the event loop
+    return await asyncio.to_thread(_scan_skills_sync)
 
 
 @app.post("/api/chat")
@@ -364,8 +576,12 @@ async def chat(req: ChatRequest):
 
     Also intercepts stop/update intents for running daemon tasks.
     """
+    low = req.message.lower()
+
     # ── Check for stop intent
-    stop_id = _detect_stop_intent(req.message)
+    stop_id = None
+    if any(h in low for h in _STOP_HINTS):
+        stop_id = _detect_stop_intent(req.message)
     if stop_id is not None:
         result = await _daemon_request("POST", f"/tasks/{stop_id}/cancel")
         async def stop_stream():
@@ -375,13 +591,15 @@ async def chat(req: ChatRequest):
                 msg = f"Task #{stop_id} cancelled."
             else:
                 msg = f"Error: {result['data'].get('detail', 'Unknown error')}"
-            yield f"data: {json.dumps({'type': 'text', 'content': msg})}\n\n"
-            yield "data: [DONE]\n\n"
+            yield _sse({'type': 'text', 'content': msg})
+            yield _SSE_DONE
         return StreamingResponse(stop_stream(), media_type="text/event-stream",
                                  headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
     # ── Check for update intent
-    update_intent = _detect_update_intent(req.message)
+    update_intent = None
+    if any(h in low for h in _UPDATE_HINTS):
+        update_intent = _detect_update_intent(req.message)
     if update_intent is not None:
         task_id, update_msg = update_intent
         result = await _daemon_request("POST", f"/tasks/{task_id}/update", {"message": update_msg})
@@ -392,8 +610,8 @@ async def chat(req: ChatRequest):
                 msg = f"Task #{task_id}: {result['data'].get('message', 'updated')}"
             else:
                 msg = f"Error: {result['data'].get('detail', 'Unknown error')}"
-            yield f"data: {json.dumps({'type': 'text', 'content': msg})}\n\n"
-            yield "data: [DONE]\n\n"
+            yield _sse({'type': 'text', 'content': msg})
+            yield _SSE_DONE
         return StreamingResponse(update_stream(), media_type="text/event-stream",
                                  headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
@@ -406,12 +624,13 @@ async def chat(req: ChatRequest):
     route = router.route(task_type="chat", prefer=req.provider)
 
     async def generate():
-        full_response = []
+        full_response = _LogBuffer(2000)
 
+        await admission.acquire()
         try:
             if route.provider == Provider.OPENAI:
                 # OpenAI: run full query, return as single SSE event
-                yield f"data: {json.dumps({'type': 'provider', 'provider': 'openai', 'model': route.model})}\n\n"
+                yield _sse({'type': 'provider', 'provider': 'openai', 'model': route.model})
                 agent = get_agent(provider="openai", model=route.model)
                 result = await agent.run(
                     prompt=prompt_text,
@@ -421,10 +640,10 @@ async def chat(req: ChatRequest):
                     max_turns=30,
                 )
                 full_response.append(result)
-                yield f"data: {json.dumps({'type': 'text', 'content': result})}\n\n"
+                yield _sse({'type': 'text', 'content': result})
             else:
                 # Claude: stream response via SSE
-                yield f"data: {json.dumps({'type': 'provider', 'provider': 'claude', 'model': route.model})}\n\n"
+                yield _sse({'type': 'provider', 'provider': 'claude', 'model': route.model})
                 options = build_agent_options(max_turns=30)
 
                 async for message in query(prompt=prompt_text, options=options):
@@ -432,28 +651,30 @@ async def chat(req: ChatRequest):
                         for block in message.content:
                             if isinstance(block, TextBlock):
                                 full_response.append(block.text)
-                                yield f"data: {json.dumps({'type': 'text', 'content': block.text})}\n\n"
+                                yield _sse({'type': 'text', 'content': block.text})
                             elif isinstance(block, ToolUseBlock):
-                                yield f"data: {json.dumps({'type': 'tool', 'name': block.name})}\n\n"
+                                yield _sse({'type': 'tool', 'name': block.name})
                     elif isinstance(message, ResultMessage):
                         pass
 
-            memory.log_conversation(role="user", content=req.message[:2000], session_id="shared_chat",
-                                    channel_type="web")
-            memory.log_conversation(
+            _queue_log(role="user", content=req.message[:2000], session_id="shared_chat",
+                       channel_type="web")
+            _queue_log(
                 role="assistant",
-                content="".join(full_response)[:2000],
+                content=full_response.text(),
                 session_id="shared_chat",
                 channel_type="web",
             )
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+            yield _sse({'type': 'error', 'content': str(e)})
+        finally:
+            await admission.release()
 
-        yield "data: [DONE]\n\n"
+        yield _SSE_DONE
 
     return StreamingResponse(
-        generate(),
+        _with_keepalive(generate()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -479,12 +700,15 @@ async def upload_file(
     # Save the file
     uploads = _get_uploads_dir()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = re.sub(r'[^\w\-.]', '_', file.filename or "unknown")
+    safe_name = _SAFE_NAME_RE.sub("_", file.filename or "unknown")
     dest = uploads / f"{timestamp}_{safe_name}"
 
-    content = await file.read()
-    dest.write_bytes(content)
-    file_size = len(content)
+    # Copy in fixed-size chunks so peak memory stays at one chunk, not the whole file
+    file_size = 0
+    with dest.open("wb") as out:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(out.write, chunk)
+            file_size += len(chunk)
 
     # Build prompt with file info
     user_text = (
@@ -502,11 +726,12 @@ async def upload_file(
     route = router.route(task_type="chat", prefer=provider)
 
     async def generate():
-        full_response = []
+        full_response = _LogBuffer(2000)
 
+        await admission.acquire()
         try:
             if route.provider == Provider.OPENAI:
-                yield f"data: {json.dumps({'type': 'provider', 'provider': 'openai', 'model': route.model})}\n\n"
+                yield _sse({'type': 'provider', 'provider': 'openai', 'model': route.model})
                 agent = get_agent(provider="openai", model=route.model)
                 result = await agent.run(
                     prompt=prompt_text,
@@ -516,9 +741,9 @@ async def upload_file(
                     max_turns=30,
                 )
                 full_response.append(result)
-                yield f"data: {json.dumps({'type': 'text', 'content': result})}\n\n"
+                yield _sse({'type': 'text', 'content': result})
             else:
-                yield f"data: {json.dumps({'type': 'provider', 'provider': 'claude', 'model': route.model})}\n\n"
+                yield _sse({'type': 'provider', 'provider': 'claude', 'model': route.model})
                 options = build_agent_options(max_turns=30)
 
                 async for msg in query(prompt=prompt_text, options=options):
@@ -526,30 +751,32 @@ async def upload_file(
                         for block in msg.content:
                             if isinstance(block, TextBlock):
                                 full_response.append(block.text)
-                                yield f"data: {json.dumps({'type': 'text', 'content': block.text})}\n\n"
+                                yield _sse({'type': 'text', 'content': block.text})
                             elif isinstance(block, ToolUseBlock):
-                                yield f"data: {json.dumps({'type': 'tool', 'name': block.name})}\n\n"
+                                yield _sse({'type': 'tool', 'name': block.name})
 
-            memory.log_conversation(
+            _queue_log(
                 role="user",
                 content=f"[File: {file.filename}] {message}"[:2000],
                 session_id="shared_chat",
                 channel_type="web",
             )
-            memory.log_conversation(
+            _queue_log(
                 role="assistant",
-                content="".join(full_response)[:2000],
+                content=full_response.text(),
                 session_id="shared_chat",
                 channel_type="web",
             )
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+            yield _sse({'type': 'error', 'content': str(e)})
+        finally:
+            await admission.release()
 
-        yield "data: [DONE]\n\n"
+        yield _SSE_DONE
 
     return StreamingResponse(
-        generate(),
+        _with_keepalive(generate()),
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
     )
@@ -619,13 +846,13 @@ async def subagent_events():
 
     async def event_stream():
         try:
-            yield f"data: {json.dumps({'type': 'connected'})}\n\n"
+            yield _sse({'type': 'connected'})
             while True:
                 try:
                     payload = await asyncio.wait_for(q.get(), timeout=30)
-                    yield f"data: {payload}\n\n"
+                    yield b"data: " + payload.encode() + b"\n\n"
                 except asyncio.TimeoutError:
-                    yield ": keepalive\n\n"
+                    yield _KEEPALIVE
         except asyncio.CancelledError:
             pass
         finally:
@@ -684,35 +911,36 @@ async def assign_task_to_subagent(task_id: int, subagent_name: str):
 
 
 # ── Proxy daemon SSE for production (no Vite proxy available) ────────
-import httpx
-
 @app.get("/daemon/{path:path}")
 async def proxy_daemon(path: str):
     """Proxy requests to daemon API (for production, replaces Vite proxy)."""
-    daemon_base = f"http://localhost:{DAEMON_PORT}"
+    client = _get_daemon_client()
 
     if path == "events":
-        # SSE proxy - stream through
+        # SSE proxy - stream through as raw bytes, no decoding or re-chunking.
+        # No chunk_size: httpx would hold events back until a full chunk arrived.
         async def stream_sse():
             try:
-                async with httpx.AsyncClient() as client:
-                    async with client.stream("GET", f"{daemon_base}/events", timeout=None) as resp:
-                        async for chunk in resp.aiter_bytes():
-                            yield chunk
+                async with client.stream("GET", "/events", timeout=None) as resp:
+                    async for chunk in resp.aiter_raw():
+                        yield chunk
             except (httpx.ConnectError, httpx.ConnectTimeout):
                 # Daemon not running — send an offline notice and close
-                yield f"data: {json.dumps({'type': 'daemon_offline', 'message': 'Daemon is not running on port ' + str(DAEMON_PORT)})}\n\n"
+                yield _sse({'type': 'daemon_offline', 'message': 'Daemon is not running on port ' + str(DAEMON_PORT)})
         return StreamingResponse(
             stream_sse(),
             media_type="text/event-stream",
             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
     else:
-        # Regular JSON proxy
+        # Regular JSON proxy - pass the daemon's bytes through, no decode/re-encode
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(f"{daemon_base}/{path}", timeout=10)
-                return resp.json()
+            resp = await client.get(f"/{path}", timeout=10)
+            return Response(
+                content=resp.content,
+                status_code=resp.status_code,
+                media_type=resp.headers.get("content-type", "application/json"),
+            )
         except (httpx.ConnectError, httpx.ConnectTimeout):
             raise HTTPException(status_code=503, detail=f"Daemon not running on port {DAEMON_PORT}")
 
@@ -31,6 +31,7 @@ from claude_agent_sdk import (
 from agelclaw.memory import Memory
 
 memory = Memory()
+memory.apply_fast_pragmas()
 from agelclaw.project import get_project_dir
 PROACTIVE_DIR = get_project_dir()
 
@@ -166,6 +167,46 @@ USING THE PROFILE:
 """
 
 
+# ── Conversation logging ─────────────────────────────────────────────
+# Turns are queued and committed by one background task, several rows per
+# transaction, instead of one SQLite commit per message on the loop.
+_log_queue: asyncio.Queue | None = None
+
+
+def _log(role: str, content: str):
+    if _log_queue is None:
+        memory.log_conversation(role=role, content=content)
+    else:
+        _log_queue.put_nowait({"role": role, "content": content})
+
+
+async def _log_flusher():
+    while True:
+        batch = [await _log_queue.get()]
+        while not _log_queue.empty():
+            batch.append(_log_queue.get_nowait())
+        try:
+            await asyncio.to_thread(memory.log_conversation_many, batch)
+        except Exception as e:
+            print(f"\n[memory] failed to log conversation: {e}", file=sys.stderr)
+        finally:
+            for _ in batch:
+                _log_queue.task_done()
+
+
+def _start_log_flusher() -> asyncio.Task:
+    global _log_queue
+    _log_queue = asyncio.Queue()
+    return asyncio.create_task(_log_flusher())
+
+
+async def _stop_log_flusher(task: asyncio.Task):
+    global _log_queue
+    await _log_queue.join()
+    task.cancel()
+    _log_queue = None
+
+
 def _build_prompt_with_history(user_input: str) -> str:
     """Build prompt with recent conversation history for context."""
     recent = memory.get_conversation_history(limit=10)
@@ -194,6 +235,9 @@ User's current message: {user_input}"""
 
 async def run_query(user_input: str) -> str:
     """Send a single query and collect the response."""
+    # History must include everything logged so far
+    if _log_queue is not None:
+        await _log_queue.join()
     prompt_with_history = _build_prompt_with_history(user_input)
 
     options = ClaudeAgentOptions(
@@ -205,7 +249,9 @@ async def run_query(user_input: str) -> str:
         max_turns=30,
     )
 
-    full_response = []
+    # Blocks go straight into one buffer, newline-separated
+    buf = io.StringIO()
+    sep = ""
     in_tools = False
 
     async for message in query(prompt=prompt_with_history, options=options):
@@ -217,7 +263,9 @@ async def run_query(user_input: str) -> str:
                         print("\r" + " " * 20 + "\r", end="", flush=True)
                         in_tools = False
                     print(block.text, end="", flush=True)
-                    full_response.append(block.text)
+                    buf.write(sep)
+                    buf.write(block.text)
+                    sep = "\n"
                 elif isinstance(block, ToolUseBlock):
                     if not in_tools:
                         in_tools = True
@@ -226,7 +274,7 @@ async def run_query(user_input: str) -> str:
     if in_tools:
         print("\r" + " " * 20 + "\r", end="", flush=True)
 
-    return "\n".join(full_response)
+    return buf.getvalue()
 
 
 async def single_query(prompt: str):
@@ -235,10 +283,14 @@ async def single_query(prompt: str):
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
-    memory.log_conversation(role="user", content=prompt)
-    response = await run_query(prompt)
-    print(response)
-    memory.log_conversation(role="assistant", content=response[:2000])
+    flusher = _start_log_flusher()
+    try:
+        _log("user", prompt)
+        response = await run_query(prompt)
+        print(response)
+        _log("assistant", response[:2000])
+    finally:
+        await _stop_log_flusher(flusher)
 
 
 def _print_banner():
@@ -257,8 +309,8 @@ def _print_banner():
     project = str(PROACTIVE_DIR)
 
     # Task stats
-    stats = memory.get_task_stats()
-    due = memory.get_due_tasks()
+    stats = memory.get_task_stats(use_cache=True)
+    due = memory.get_due_tasks(use_cache=True)
     pending = stats.get("pending", 0)
     completed = stats.get("completed", 0)
 
@@ -291,15 +343,22 @@ async def main(initial_prompt: str = None):
         os.system("")
 
     _print_banner()
+    flusher = _start_log_flusher()
+    try:
+        await _chat_loop(initial_prompt)
+    finally:
+        await _stop_log_flusher(flusher)
+
 
+async def _chat_loop(initial_prompt: str = None):
     # Process initial prompt if provided (agelclaw "do something")
     if initial_prompt:
         print(f"\033[1m> \033[0m{initial_prompt}")
-        memory.log_conversation(role="user", content=initial_prompt)
+        _log("user", initial_prompt)
         print()
         response = await run_query(initial_prompt)
         print("\n")
-        memory.log_conversation(role="assistant", content=response[:2000])
+        _log("assistant", response[:2000])
 
     while True:
         try:
@@ -317,12 +376,12 @@ async def main(initial_prompt: str = None):
 
         # Quick local commands (no agent call needed)
         if user_input.lower() == "stats":
-            s = memory.get_task_stats()
+            s = memory.get_task_stats(use_cache=True)
             print(f"\n{json.dumps(s, indent=2)}\n")
             continue
 
         # Log user message
-        memory.log_conversation(role="user", content=user_input)
+        _log("user", user_input)
 
         # Send to agent
         print()
@@ -330,10 +389,7 @@ async def main(initial_prompt: str = None):
         print("\n")
 
         # Log agent response
-        memory.log_conversation(
-            role="assistant",
-            content=response[:2000],
-        )
+        _log("assistant", response[:2000])
 
 
 if __name__ == "__main__":
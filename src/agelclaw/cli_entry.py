@@ -216,6 +216,7 @@ def status():
     try:
         from agelclaw.memory import Memory
         mem = Memory()
+        mem.apply_fast_pragmas()
         stats = mem.get_task_stats()
         click.echo("  Task Statistics:")
         for key, val in stats.items():
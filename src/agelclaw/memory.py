@@ -13,6 +13,8 @@ Stores:
 
 import sqlite3
 import json
+import sys
+import time
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -24,6 +26,20 @@ log = logging.getLogger("memory")
 from agelclaw.project import get_db_path
 DB_PATH = get_db_path()
 
+# Enabled by Memory.apply_fast_pragmas(). Only journal_mode persists in the
+# database file, so these are set on every connection _conn() opens.
+_FAST_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    # SQLite clamps this to its compile-time maximum; keep 32-bit address space free
+    "PRAGMA mmap_size=30000000000" if sys.maxsize > 2**32 else "PRAGMA mmap_size=268435456",
+)
+
+# get_task_stats/get_due_tasks(use_cache=True): results are reused for this long
+# unless this instance writes to the tasks table first.
+_TASK_CACHE_TTL = 2.0
+
 
 class Memory:
     def __init__(self, db_path: Path = None):
@@ -31,6 +47,9 @@ class Memory:
             db_path = get_db_path()
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fast_pragmas = False
+        self._task_version = 0  # bumped on every write to tasks
+        self._task_cache: dict[str, tuple[float, int, object]] = {}
         self._init_db()
         self._embedding_store = None  # lazy init
 
@@ -40,6 +59,9 @@ class Memory:
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA foreign_keys=ON")
+        if self._fast_pragmas:
+            for pragma in _FAST_PRAGMAS:
+                conn.execute(pragma)
         try:
             yield conn
             conn.commit()
@@ -49,6 +71,16 @@ class Memory:
         finally:
             conn.close()
 
+    def apply_fast_pragmas(self) -> None:
+        """Tune every connection from now on for read-heavy interactive use.
+
+        Adds the _FAST_PRAGMAS bundle (mmap, 64 MB page cache, in-memory
+        temp store, synchronous=NORMAL) and runs PRAGMA optimize once.
+        """
+        self._fast_pragmas = True
+        with self._conn() as conn:
+            conn.execute("PRAGMA optimize")
+
     def _init_db(self):
         with self._conn() as conn:
             conn.executescript("""
@@ -148,6 +180,7 @@ class Memory:
                 CREATE INDEX IF NOT EXISTS idx_tasks_next_run ON tasks(next_run_at);
                 CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
                 CREATE INDEX IF NOT EXISTS idx_conversations_session ON conversations(session_id);
+                CREATE INDEX IF NOT EXISTS idx_conversations_session_created ON conversations(session_id, created_at DESC);
                 CREATE INDEX IF NOT EXISTS idx_conversations_task ON conversations(task_id);
                 CREATE INDEX IF NOT EXISTS idx_profile_category ON user_profile(category);
             """)
@@ -175,6 +208,36 @@ class Memory:
             except sqlite3.OperationalError:
                 pass  # Already exists
 
+            # Migration: FTS5 index over conversations for keyword recall
+            try:
+                has_fts = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'conversations_fts'"
+                ).fetchone()
+                conn.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                        content, session_id UNINDEXED,
+                        content='conversations', content_rowid='id'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations BEGIN
+                        INSERT INTO conversations_fts(rowid, content, session_id)
+                        VALUES (new.id, new.content, new.session_id);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations BEGIN
+                        INSERT INTO conversations_fts(conversations_fts, rowid, content, session_id)
+                        VALUES ('delete', old.id, old.content, old.session_id);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_au AFTER UPDATE ON conversations BEGIN
+                        INSERT INTO conversations_fts(conversations_fts, rowid, content, session_id)
+                        VALUES ('delete', old.id, old.content, old.session_id);
+                        INSERT INTO conversations_fts(rowid, content, session_id)
+                        VALUES (new.id, new.content, new.session_id);
+                    END;
+                """)
+                if not has_fts:
+                    conn.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5 — recall falls back to LIKE
+
     # ─────────────────────────────────────────
     # Embeddings (lazy init)
     # ─────────────────────────────────────────
@@ -248,8 +311,19 @@ class Memory:
                     assigned_to,
                 ),
             )
+            self._task_version += 1
             return cur.lastrowid
 
+    def _cached_task_read(self, key: str, read):
+        """Return read() from the short-lived task cache, refreshing it when stale."""
+        now = time.monotonic()
+        hit = self._task_cache.get(key)
+        if hit and hit[1] == self._task_version and now - hit[0] < _TASK_CACHE_TTL:
+            return hit[2]
+        value = read()
+        self._task_cache[key] = (now, self._task_version, value)
+        return value
+
     def get_task(self, task_id: int) -> Optional[dict]:
         with self._conn() as conn:
             row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
@@ -269,8 +343,13 @@ class Memory:
             ).fetchall()
             return [dict(r) for r in rows]
 
-    def get_due_tasks(self) -> list[dict]:
-        """Get tasks that are due now (scheduled or recurring)."""
+    def get_due_tasks(self, use_cache: bool = False) -> list[dict]:
+        """Get tasks that are due now (scheduled or recurring).
+
+        use_cache=True may return a result up to _TASK_CACHE_TTL seconds old.
+        """
+        if use_cache:
+            return list(self._cached_task_read("due", self.get_due_tasks))
         now = datetime.now().isoformat()
         with self._conn() as conn:
             rows = conn.execute(
@@ -350,6 +429,7 @@ class Memory:
             conn.execute(
                 f"UPDATE tasks SET {set_clause} WHERE id = ?", values
             )
+        self._task_version += 1
 
     def start_task(self, task_id: int) -> None:
         self.update_task(task_id, status="in_progress")
@@ -407,11 +487,15 @@ class Memory:
 
             # Delete the task
             conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self._task_version += 1
 
             log.info(f"Task #{task_id} deleted: {task.get('title', 'Untitled')}")
             return True
 
-    def get_task_stats(self) -> dict:
+    def get_task_stats(self, use_cache: bool = False) -> dict:
+        """Task counts by status plus total (use_cache: see get_due_tasks)."""
+        if use_cache:
+            return dict(self._cached_task_read("stats", self.get_task_stats))
         with self._conn() as conn:
             rows = conn.execute(
                 "SELECT status, COUNT(*) as count FROM tasks GROUP BY status"
@@ -420,6 +504,25 @@ class Memory:
             stats["total"] = sum(stats.values())
             return stats
 
+    def get_subagent_stats_bulk(self, names: list[str]) -> dict[str, dict]:
+        """Get task statistics for several subagents in one GROUP BY query."""
+        result = {name: {} for name in names}
+        if not names:
+            return result
+        placeholders = ",".join("?" * len(names))
+        with self._conn() as conn:
+            rows = conn.execute(
+                f"""SELECT assigned_to, status, COUNT(*) as count FROM tasks
+                   WHERE assigned_to IN ({placeholders})
+                   GROUP BY assigned_to, status""",
+                list(names),
+            ).fetchall()
+        for row in rows:
+            result[row["assigned_to"]][row["status"]] = row["count"]
+        for stats in result.values():
+            stats["total"] = sum(stats.values())
+        return result
+
     def get_recent_completed(self, limit: int = 10) -> list[dict]:
         with self._conn() as conn:
             rows = conn.execute(
@@ -500,6 +603,7 @@ class Memory:
                 "UPDATE tasks SET assigned_to = NULL, updated_at = ? WHERE id = ?",
                 (datetime.now().isoformat(), task_id),
             )
+            self._task_version += 1
         return True
 
     # ─────────────────────────────────────────
@@ -528,6 +632,27 @@ class Memory:
         self._embed_async("embed_conversation", conv_id, content)
         return conv_id
 
+    def log_conversation_many(self, rows: list[dict]) -> list[int]:
+        """Log several messages in one transaction.
+
+        Each row takes the same keys as log_conversation()'s arguments.
+        """
+        ids = []
+        with self._conn() as conn:
+            for row in rows:
+                cur = conn.execute(
+                    """INSERT INTO conversations
+                       (role, content, task_id, session_id, tokens_used, cost, channel_type, chat_id)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (row["role"], row["content"], row.get("task_id"), row.get("session_id"),
+                     row.get("tokens_used", 0), row.get("cost", 0), row.get("channel_type", "web"),
+                     row.get("chat_id")),
+                )
+                ids.append(cur.lastrowid)
+        for conv_id, row in zip(ids, rows):
+            self._embed_async("embed_conversation", conv_id, row["content"])
+        return ids
+
     def get_conversation_history(
         self, session_id: str = None, limit: int = 50
     ) -> list[dict]: